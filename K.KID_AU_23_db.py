@@ -1,24 +1,170 @@
 import sqlite3
-from main import db_file_path
+import threading
+import queue
+from contextlib import contextmanager
+import changelog
+from main import db_file_path, connect, iter_pages, page_through, PAGE_SIZE
 DB_NAME = db_file_path('university.db')
+# O'zgarishlar jurnali yuritiladigan jadvallar
+CDC_TABLES = ("roles", "users", "students")
+# Sxemani o'zgartiradigan so'rovlar (katalogni yangilash uchun)
+DDL_KEYWORDS = ("CREATE", "ALTER", "DROP")
+
+
+class ConnectionPool:
+    """Cheklangan hajmdagi SQLite ulanishlar hovuzi.
+
+    Har bir oqim bir vaqtda bitta ulanishni oladi: ichma-ich `connection()`
+    chaqiruvlari o'sha oqimdagi ulanishni qayta ishlatadi.
+    """
+
+    def __init__(self, db_name, max_size=5, timeout=30, profile=None):
+        self.db_name = db_name
+        self.profile = profile
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        self._created = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+
+    def _connect(self):
+        return connect(self.db_name, self.profile, check_same_thread=False)
+
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _acquire(self):
+        if self._closed:
+            raise sqlite3.ProgrammingError("Ulanishlar hovuzi yopilgan.")
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._created < self.max_size:
+                    self._created += 1
+                    try:
+                        return self._connect()
+                    except sqlite3.Error:
+                        self._created -= 1
+                        raise
+            try:
+                conn = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise sqlite3.OperationalError("Bo'sh ulanish kutish vaqti tugadi.")
+        if not self._is_healthy(conn):
+            conn.close()
+            conn = self._connect()
+        return conn
+
+    def _release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Joriy oqim uchun ulanishni hovuzdan olib, keyin qaytaradi."""
+        local = self._local
+        if getattr(local, "conn", None) is not None:
+            local.depth += 1
+            try:
+                yield local.conn
+            finally:
+                local.depth -= 1
+            return
+        local.conn = self._acquire()
+        local.depth = 1
+        try:
+            yield local.conn
+        finally:
+            conn, local.conn = local.conn, None
+            self._release(conn)
+
+    def close(self):
+        """Hovuzdagi barcha bo'sh ulanishlarni yopadi."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class SchemaCatalog:
+    """Jadval va maydonlar haqidagi ma'lumotlarni xotirada saqlaydi.
+
+    Katalog bir marta yuklanadi va `PRAGMA schema_version` o'zgarganda
+    (jadval yaratilsa, o'zgartirilsa yoki o'chirilsa) qayta yuklanadi.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._version = None
+        self._tables = {}
+        self._stale = True
+
+    def invalidate(self):
+        """Katalogni keyingi murojaatda qayta yuklashga belgilaydi."""
+        self._stale = True
+
+    def _refresh(self, conn):
+        version = conn.execute("PRAGMA schema_version").fetchone()[0]
+        if not self._stale and version == self._version:
+            return
+        tables = {}
+        names = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        ).fetchall()
+        for (name,) in names:
+            info = conn.execute(f'PRAGMA table_info("{name}")').fetchall()
+            tables[name] = {column[1]: column[2] for column in info}
+        self._tables = tables
+        self._version = version
+        self._stale = False
+
+    def tables(self):
+        """Jadval nomlari ro'yxati."""
+        with self.pool.connection() as conn:
+            self._refresh(conn)
+        return list(self._tables)
+
+    def columns(self, table):
+        """Jadval maydonlari va ularning turlari ({nom: tur})."""
+        with self.pool.connection() as conn:
+            self._refresh(conn)
+        return self._tables.get(table, {})
 
 
 class DatabaseManager:
     """SQLite ma'lumotlar bazasi boshqaruvi."""
     
-    def __init__(self, db_name):
+    def __init__(self, db_name, pool_size=5, profile=None):
         self.db_name = db_name
+        self.pool = ConnectionPool(db_name, max_size=pool_size, profile=profile)
+        self.catalog = SchemaCatalog(self.pool)
 
     def execute_query(self, query, params=None):
         """SQL so'rovini bajarish."""
         try:
-            with sqlite3.connect(self.db_name) as conn:
+            with self.pool.connection() as conn:
                 cursor = conn.cursor()
                 if params:
                     cursor.execute(query, params)
                 else:
                     cursor.execute(query)
                 conn.commit()
+                if query.lstrip().upper().startswith(DDL_KEYWORDS):
+                    self.catalog.invalidate()
                 return cursor
         except sqlite3.OperationalError as e:
             print("Xato:", e)
@@ -26,22 +172,30 @@ class DatabaseManager:
 
     def fetch_all(self, query):
         """Ma'lumotlarni olish uchun so'rov."""
-        with sqlite3.connect(self.db_name) as conn:
+        with self.pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query)
             return cursor.fetchall()
 
+    def fetch_pages(self, table, page_size=PAGE_SIZE):
+        """Jadvalni rowid bo'yicha sahifalab o'qiydi (har sahifa - ro'yxat)."""
+        with self.pool.connection() as conn:
+            yield from iter_pages(conn, table, page_size, key="rowid")
+
     def get_columns(self, table):
         """Jadvalning maydonlarini olish."""
-        query = f"PRAGMA table_info({table});"
-        return [column[1] for column in self.fetch_all(query)]
+        return list(self.catalog.columns(table))
+
+    def close(self):
+        """Ulanishlar hovuzini yopadi."""
+        self.pool.close()
 
 
 class UniversityApp:
     """Universitet tizimini boshqaruvchi dastur."""
     
-    def __init__(self):
-        self.db = DatabaseManager(DB_NAME)
+    def __init__(self, db_name=DB_NAME, profile=None):
+        self.db = DatabaseManager(db_name, profile=profile)
         self.create_tables()
 
     def create_tables(self):
@@ -82,6 +236,10 @@ class UniversityApp:
         ]
         for table in tables:
             self.db.execute_query(table)
+        with self.db.pool.connection() as conn:
+            for table in CDC_TABLES:
+                changelog.install(conn, table)
+        self.db.catalog.invalidate()
 
     def display_menu(self):
         """Foydalanuvchi menyusi."""
@@ -96,12 +254,10 @@ class UniversityApp:
     def view_data(self):
         """Jadval ma'lumotlarini ko'rish."""
         table = input("Qaysi jadvalni ko'rmoqchisiz? (masalan: students, users): ")
-        query = f"SELECT * FROM {table}"
-        records = self.db.fetch_all(query)
-        if records:
-            for record in records:
-                print(record)
-        else:
+        if table not in self.db.catalog.tables():
+            print("Jadval bo'sh yoki noto'g'ri nom kiritildi!")
+            return
+        if not page_through(self.db.fetch_pages(table)):
             print("Jadval bo'sh yoki noto'g'ri nom kiritildi!")
 
     def add_data(self):
@@ -167,6 +323,7 @@ class UniversityApp:
                 self.delete_data()
             elif choice == "5":
                 print("Chiqish...")
+                self.db.close()
                 break
             else:
                 print("Noto'g'ri tanlov, qayta urinib ko'ring!")
@@ -0,0 +1,387 @@
+"""Saqlash modullari uchun takrorlanadigan benchmark to'plami.
+
+Har bir modul (inson_db, ticher_db, student_db, K.KID_AU_23_db va SQLAlchemy
+modullari, jumladan sqlchemiy_connect hisob yaratish va rol keshi) vaqtinchalik papkada sintetik ma'lumot bilan to'ldiriladi va
+asosiy amallar o'lchanadi. Natija JSON ko'rinishida yoziladi; oldingi
+natija (`--baseline`) berilsa, sekinlashgan amallar regressiya deb
+belgilanadi va dastur 1 kodi bilan tugaydi.
+
+Misol::
+
+    python benchmarks.py --sizes 10k,1m --out natija.json
+    python benchmarks.py --sizes 10k --baseline natija.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from main import iter_chunks, load_module
+
+MODULES = ("inson", "ticher", "student", "university", "sqlalchemy", "provisioning")
+# Bitta o'lchovda bajariladigan nuqtaviy amallar soni
+POINT_OPS = 200
+# Parol xeshlash qimmat: hisob yaratish shu sondan oshmaydi va kam raundda o'lchanadi
+PROVISION_LIMIT = 2000
+PROVISION_ROUNDS = 4
+# Shu ulushdan ko'p sekinlashish regressiya hisoblanadi
+DEFAULT_THRESHOLD = 0.20
+
+FAMILIYALAR = ["Karimov", "Aliyev", "Rahimov", "Yusupov", "Toshmatov", "Sobirov", "Nazarov", "Qodirov"]
+ISMLAR = ["Aziz", "Bobur", "Dilshod", "Jasur", "Malika", "Nodira", "Sardor", "Zarina"]
+MILLATLAR = ["o'zbek", "qozoq", "tojik", "rus", "qoraqalpoq"]
+FAKULTETLAR = ["Dasturiy injiniring", "Kompyuter injiniringi", "Iqtisodiyot", "Matematika"]
+
+
+def parse_size(text):
+    """'10k', '1m', '10m' kabi yozuvni butun songa aylantiradi."""
+    text = text.strip().lower()
+    multiplier = {"k": 1000, "m": 1000000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * multiplier)
+
+
+class Timer:
+    """Amallar vaqtini yig'uvchi."""
+
+    def __init__(self):
+        self.results = {}
+
+    @contextlib.contextmanager
+    def measure(self, operation, ops):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+        seconds = time.perf_counter() - started
+        self.results[operation] = {
+            "ops": ops,
+            "seconds": round(seconds, 6),
+            "ops_per_sec": round(ops / seconds, 2) if seconds > 0 else None,
+        }
+
+
+def person_rows(size, rng):
+    """(familya, ism, otasi_ismi, jinsi, millati, son, tugilgan_sana) qatorlari."""
+    start = date(1950, 1, 1)
+    for _ in range(size):
+        jinsi = rng.choice(("Erkak", "Ayol"))
+        yield (
+            rng.choice(FAMILIYALAR) + ("a" if jinsi == "Ayol" else ""),
+            rng.choice(ISMLAR),
+            rng.choice(ISMLAR),
+            jinsi,
+            rng.choice(MILLATLAR),
+            rng.randint(150, 200),
+            (start + timedelta(days=rng.randint(0, 20000))).isoformat(),
+        )
+
+
+def student_rows(size, rng):
+    for row in person_rows(size, rng):
+        yield row[:5] + (float(rng.randint(45, 110)), row[6], "TATU",
+                         rng.choice(FAKULTETLAR), rng.randint(1, 4), round(rng.uniform(2, 5), 2))
+
+
+def bench_inson(size, workdir, rng):
+    import inson_db
+
+    timer = Timer()
+    db = inson_db.DatabaseManager(db_name=os.path.join(workdir, "inson.db"))
+    with timer.measure("bulk_insert", size):
+        db.add_records(person_rows(size, rng))
+    sample = next(person_rows(1, rng))
+    with timer.measure("insert", POINT_OPS):
+        for _ in range(POINT_OPS):
+            db.add_record(*sample)
+    ids = [rng.randint(1, size) for _ in range(POINT_OPS)]
+    with timer.measure("point_lookup", POINT_OPS):
+        for record_id in ids:
+            db.conn.execute("SELECT * FROM inson WHERE id = ?", (record_id,)).fetchone()
+    searches = {
+        "search_by_familya": lambda: db.search_by_familya("rimov"),
+        "search_by_ism": lambda: db.search_by_ism("Bob"),
+        "search_by_jinsi": lambda: db.search_by_jinsi("Ayol"),
+        "search_by_boyi": lambda: db.search_by_boyi(170, 171),
+        "search_by_tugilgan_sana": lambda: db.search_by_tugilgan_sana("1980-05-05"),
+    }
+    for name, search in searches.items():
+        with timer.measure(name, 3):
+            for _ in range(3):
+                search()
+    with timer.measure("count", POINT_OPS):
+        for _ in range(POINT_OPS):
+            db.count_records()
+    with timer.measure("update", POINT_OPS):
+        for record_id in ids:
+            db.update_record(record_id, *sample)
+    with timer.measure("delete", POINT_OPS):
+        for record_id in ids:
+            db.delete_record(record_id)
+    db.close_connection()
+    return timer.results
+
+
+def bench_ticher(size, workdir, rng):
+    import ticher_db
+
+    timer = Timer()
+    db = ticher_db.UsersDatabase(db_name=os.path.join(workdir, "ticher.db"))
+    rows = (row[:5] + (float(row[5] // 3), row[6]) for row in person_rows(size, rng))
+    with timer.measure("bulk_insert", size):
+        db.insert_many(rows)
+    sample = next(person_rows(1, rng))
+    with timer.measure("insert", POINT_OPS):
+        for _ in range(POINT_OPS):
+            db.insert_data(*sample)
+    ids = [rng.randint(1, size) for _ in range(POINT_OPS)]
+    with timer.measure("point_lookup", POINT_OPS):
+        for record_id in ids:
+            db.conn.execute("SELECT * FROM ticher WHERE id = ?", (record_id,)).fetchone()
+    with timer.measure("count", POINT_OPS):
+        for _ in range(POINT_OPS):
+            db.count_data()
+    with timer.measure("update", POINT_OPS):
+        for record_id in ids:
+            db.update_data(record_id, "ogirligi", 70.0)
+    with timer.measure("delete", POINT_OPS):
+        for record_id in ids:
+            db.delete_data(record_id)
+    db.close_connection()
+    return timer.results
+
+
+def bench_student(size, workdir, rng):
+    import student_db
+
+    timer = Timer()
+    db = student_db.StudentDatabase(db_name=os.path.join(workdir, "student.db"))
+    with timer.measure("bulk_insert", size):
+        db.add_students(student_rows(size, rng))
+    sample = next(student_rows(1, rng))
+    with timer.measure("insert", POINT_OPS):
+        for _ in range(POINT_OPS):
+            db.add_student(*sample)
+    ids = [rng.randint(1, size) for _ in range(POINT_OPS)]
+    with timer.measure("point_lookup", POINT_OPS):
+        for student_id in ids:
+            db.get_last_saved_time(student_id)
+    with timer.measure("count", POINT_OPS):
+        for _ in range(POINT_OPS):
+            db.count_students()
+    with timer.measure("update", POINT_OPS):
+        for student_id in ids:
+            db.update_student(student_id, {"ortacha_bal": 4.0})
+    with timer.measure("delete", POINT_OPS):
+        for student_id in ids:
+            db.delete_student(student_id)
+    db.close_connection()
+    return timer.results
+
+
+def bench_university(size, workdir, rng):
+    university = load_module("K.KID_AU_23_db.py")
+
+    timer = Timer()
+    app = university.UniversityApp(db_name=os.path.join(workdir, "university.db"))
+    rows = ((row[0], row[1], row[6], f"s{i}@example.com") for i, row in enumerate(person_rows(size, rng)))
+    query = "INSERT INTO students (first_name, last_name, birth_date, email) VALUES (?, ?, ?, ?)"
+    with timer.measure("bulk_insert", size):
+        with app.db.pool.connection() as conn:
+            for chunk in iter_chunks(rows):
+                conn.executemany(query, chunk)
+                conn.commit()
+    with timer.measure("insert", POINT_OPS):
+        for i in range(POINT_OPS):
+            app.db.execute_query(query, ("Aziz", "Karimov", "2000-01-01", f"new{i}@example.com"))
+    ids = [rng.randint(1, size) for _ in range(POINT_OPS)]
+    with timer.measure("point_lookup", POINT_OPS):
+        for student_id in ids:
+            app.db.fetch_all(f"SELECT * FROM students WHERE id = {student_id}")
+    with timer.measure("get_columns", POINT_OPS):
+        for _ in range(POINT_OPS):
+            app.db.get_columns("students")
+    with timer.measure("count", POINT_OPS):
+        for _ in range(POINT_OPS):
+            app.db.fetch_all("SELECT COUNT(*) FROM students")
+    with timer.measure("update", POINT_OPS):
+        for student_id in ids:
+            app.db.execute_query("UPDATE students SET phone_number = ? WHERE id = ?", ("+998", student_id))
+    with timer.measure("delete", POINT_OPS):
+        for student_id in ids:
+            app.db.execute_query("DELETE FROM students WHERE id = ?", (student_id,))
+    app.db.close()
+    return timer.results
+
+
+def bench_sqlalchemy(size, workdir, rng):
+    try:
+        import sqlchemiy_test
+    except ImportError as error:
+        return {"skipped": str(error)}
+
+    timer = Timer()
+    session = sqlchemiy_test.session
+    Student = sqlchemiy_test.Student
+    with contextlib.redirect_stdout(io.StringIO()):
+        sqlchemiy_test.create_group("Bench")
+    group_id = sqlchemiy_test.reference_cache.get_id(session, sqlchemiy_test.Group, "Bench")
+    rows = ({"first_name": row[1], "last_name": row[0], "email": f"s{i}@example.com",
+             "major": "CS", "group_id": group_id} for i, row in enumerate(person_rows(size, rng)))
+    with timer.measure("bulk_insert", size):
+        for chunk in iter_chunks(rows):
+            session.execute(Student.__table__.insert(), chunk)
+            session.commit()
+    with timer.measure("insert", POINT_OPS):
+        for i in range(POINT_OPS):
+            sqlchemiy_test.create_student("Aziz", "Karimov", f"new{i}@example.com", "CS", "Bench")
+    ids = [rng.randint(1, size) for _ in range(POINT_OPS)]
+    with timer.measure("point_lookup", POINT_OPS):
+        for student_id in ids:
+            session.get(Student, student_id)
+    with timer.measure("count", POINT_OPS):
+        for _ in range(POINT_OPS):
+            session.query(Student).count()
+    with timer.measure("update", POINT_OPS):
+        for student_id in ids:
+            sqlchemiy_test.update_student_major(f"s{student_id - 1}@example.com", "Data Science")
+    with timer.measure("delete", len(set(ids))):
+        for student_id in set(ids):
+            session.query(Student).filter_by(id=student_id).delete()
+        session.commit()
+    session.close()
+    return timer.results
+
+
+def bench_provisioning(size, workdir, rng):
+    try:
+        import sqlchemiy_connect
+    except ImportError as error:
+        return {"skipped": str(error)}
+
+    timer = Timer()
+    session = sqlchemiy_connect.session
+    count = min(size, PROVISION_LIMIT)
+    roles = ("admin", "user", "guest")
+    accounts = [(f"user{i}", f"user{i}@example.com", f"parol{i}", [rng.choice(roles)]) for i in range(count)]
+    with timer.measure("bulk_create_users", count):
+        sqlchemiy_connect.bulk_create_users(accounts, rounds=PROVISION_ROUNDS, db_session=session)
+    accounts = [(f"solo{i}", f"solo{i}@example.com", f"parol{i}", [rng.choice(roles)]) for i in range(count)]
+    with timer.measure("bulk_create_users_1_worker", count):
+        sqlchemiy_connect.bulk_create_users(accounts, workers=1, rounds=PROVISION_ROUNDS, db_session=session)
+    names = [rng.choice(roles) for _ in range(POINT_OPS)]
+    with timer.measure("role_lookup", POINT_OPS):
+        for name in names:
+            sqlchemiy_connect.get_role(name)
+    with timer.measure("role_lookup_cold", POINT_OPS):
+        for name in names:
+            sqlchemiy_connect.reference_cache.invalidate()
+            sqlchemiy_connect.get_role(name)
+    session.close()
+    sqlchemiy_connect.engine.dispose()
+    return timer.results
+
+
+BENCHMARKS = {
+    "inson": bench_inson,
+    "ticher": bench_ticher,
+    "student": bench_student,
+    "university": bench_university,
+    "sqlalchemy": bench_sqlalchemy,
+    "provisioning": bench_provisioning,
+}
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Oldingi natijaga nisbatan sekinlashgan amallar ro'yxati."""
+    regressions = []
+    for module, by_size in results["results"].items():
+        for size, operations in by_size.items():
+            old_operations = baseline.get("results", {}).get(module, {}).get(size, {})
+            for operation, stats in operations.items():
+                old = old_operations.get(operation)
+                if not isinstance(stats, dict) or not isinstance(old, dict):
+                    continue
+                if not stats.get("ops_per_sec") or not old.get("ops_per_sec"):
+                    continue
+                ratio = stats["ops_per_sec"] / old["ops_per_sec"]
+                if ratio < 1 - threshold:
+                    regressions.append({
+                        "module": module, "size": size, "operation": operation,
+                        "baseline_ops_per_sec": old["ops_per_sec"],
+                        "ops_per_sec": stats["ops_per_sec"],
+                        "change": round(ratio - 1, 4),
+                    })
+    return regressions
+
+
+def run(sizes, modules, seed):
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": seed,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        },
+        "results": {},
+    }
+    start_dir = os.getcwd()
+    for module in modules:
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as workdir:
+                # Modullar bazani joriy papkaga nisbatan ochadi
+                os.chdir(workdir)
+                try:
+                    stats = BENCHMARKS[module](size, workdir, random.Random(seed))
+                finally:
+                    os.chdir(start_dir)
+                    sys.modules.pop("sqlchemiy_test", None)
+                    sys.modules.pop("sqlchemiy_connect", None)
+            results["results"].setdefault(module, {})[str(size)] = stats
+            print(f"{module} ({size} qator): tayyor", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Saqlash modullari benchmarki")
+    parser.add_argument("--sizes", default="10k", help="masalan: 10k,1m,10m")
+    parser.add_argument("--modules", default=",".join(MODULES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="natija JSON fayli (berilmasa stdout)")
+    parser.add_argument("--baseline", help="solishtirish uchun oldingi natija")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    modules = [module.strip() for module in args.modules.split(",")]
+    unknown = set(modules) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"noma'lum modul: {', '.join(sorted(unknown))}")
+
+    results = run(sizes, modules, args.seed)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            results["regressions"] = compare(results, json.load(file), args.threshold)
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    for regression in results.get("regressions", []):
+        print(f"REGRESSIYA: {regression['module']}/{regression['size']}/{regression['operation']}: "
+              f"{regression['change']:+.1%}", file=sys.stderr)
+    return 1 if results.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""O'zgarishlar jurnali (CDC) va boshqa bazaga bosqichma-bosqich ko'chirish.
+
+Kuzatiladigan har bir jadvalga INSERT/UPDATE/DELETE triggerlari o'rnatiladi.
+Ular `changelog` jadvaliga o'sib boruvchi `seq` raqami bilan qisqa yozuv
+qo'shadi: jadval nomi, amal (I/U/D), qator id si va yangi qator JSON
+ko'rinishida. Iste'molchi (`sync`) oxirgi ko'chirilgan `seq` dan keyingi
+o'zgarishlarni bo'laklab olib, nishon bazaga qo'llaydi. Nishondagi nazorat
+nuqtasi o'zgarishlar bilan bitta tranzaksiyada yangilanadi, shuning uchun
+jarayon uzilsa ham o'zgarishlar ikki marta qo'llanmaydi.
+
+Triggerlar o'rnatilishidan oldin mavjud bo'lgan qatorlar jurnalda yo'q.
+Shuning uchun nishon birinchi marta (nazorat nuqtasisiz) ko'chirilganda
+kuzatiladigan jadvallar bitta o'qish tranzaksiyasida to'liq nusxalanadi
+va nazorat nuqtasi shu paytdagi oxirgi `seq` ga qo'yiladi.
+
+Jurnal `CHANGELOG_RETENTION` qatordan oshmaydi: eskilari `install` da
+o'chiriladi. Iste'molchi o'chirilgan o'zgarishlarga muhtoj bo'lsa, `sync`
+xato beradi (nishonni qaytadan yaratish kerak). Yagona iste'molchi
+`--prune` bilan qo'llangan o'zgarishlarni darhol o'chirishi mumkin.
+
+Misol::
+
+    python changelog.py all_databas/student_db.db hisobot/student_db.db --prune
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+CHANGELOG_TABLE = "changelog"
+CHECKPOINT_TABLE = "sync_checkpoint"
+SYNC_BATCH_SIZE = 5000
+# Jurnalda saqlanadigan eng ko'p o'zgarishlar soni
+CHANGELOG_RETENTION = int(os.environ.get("CHANGELOG_RETENTION", 1_000_000))
+
+
+def _row_json(columns, alias):
+    # BLOB qiymatlarni JSON saqlay olmaydi, ular {"$hex": "..."} ko'rinishida yoziladi
+    pairs = ", ".join(
+        f"'{column}', CASE WHEN typeof({alias}.{column}) = 'blob' "
+        f"THEN json_object('$hex', hex({alias}.{column})) ELSE {alias}.{column} END"
+        for column in columns)
+    return f"json_object({pairs})"
+
+
+def _triggers(table, columns):
+    """Jadval triggerlari: {nom: CREATE TRIGGER matni}.
+
+    Matn sqlite_master dagi ko'rinishi bilan bir xil, shuning uchun ustunlar
+    o'zgarganini matnlarni solishtirib aniqlash mumkin.
+    """
+    return {
+        f"{table}_cdc_ai": f"""CREATE TRIGGER {table}_cdc_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {CHANGELOG_TABLE} (table_name, op, row_id, data)
+                VALUES ('{table}', 'I', NEW.rowid, {_row_json(columns, "NEW")});
+            END""",
+        f"{table}_cdc_au": f"""CREATE TRIGGER {table}_cdc_au AFTER UPDATE ON {table} BEGIN
+                INSERT INTO {CHANGELOG_TABLE} (table_name, op, row_id, data)
+                SELECT '{table}', 'D', OLD.rowid, NULL WHERE OLD.rowid IS NOT NEW.rowid;
+                INSERT INTO {CHANGELOG_TABLE} (table_name, op, row_id, data)
+                VALUES ('{table}', 'U', NEW.rowid, {_row_json(columns, "NEW")});
+            END""",
+        f"{table}_cdc_ad": f"""CREATE TRIGGER {table}_cdc_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {CHANGELOG_TABLE} (table_name, op, row_id, data)
+                VALUES ('{table}', 'D', OLD.rowid, NULL);
+            END""",
+    }
+
+
+def install(conn, table, retention=CHANGELOG_RETENTION):
+    """Jadvalga o'zgarishlar jurnali triggerlarini o'rnatadi.
+
+    Triggerlar joriy ustunlar ro'yxati bilan yoziladi; jadvalga ustun
+    qo'shilgan bo'lsa, ular qayta yaratiladi. O'zgarish bo'lmasa sxemaga
+    tegilmaydi. Jurnal `retention` qatorgacha qisqartiriladi.
+    """
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+    existing = dict(conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (table,)))
+    stale = {name: sql for name, sql in _triggers(table, columns).items() if existing.get(name) != sql}
+    if stale:
+        conn.execute("BEGIN")
+        try:
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS {CHANGELOG_TABLE} (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    table_name TEXT NOT NULL,
+                    op TEXT NOT NULL,
+                    row_id INTEGER NOT NULL,
+                    data TEXT
+                )
+            ''')
+            for name, sql in stale.items():
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                conn.execute(sql)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    trim(conn, retention)
+
+
+def tracked_tables(conn):
+    """Jurnal triggerlari o'rnatilgan jadvallar."""
+    return [row[0] for row in conn.execute(
+        "SELECT tbl_name FROM sqlite_master WHERE type = 'trigger' AND name = tbl_name || '_cdc_ai' "
+        "ORDER BY tbl_name")]
+
+
+def last_seq(conn):
+    """Berilgan oxirgi o'zgarish raqami (jurnal bo'lmasa 0).
+
+    Jurnal to'liq tozalangan bo'lsa ham AUTOINCREMENT hisoblagichidan olinadi.
+    """
+    try:
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (CHANGELOG_TABLE,)).fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] if row else 0
+
+
+def first_seq(conn):
+    """Jurnalda hali saqlanayotgan eng eski o'zgarish raqami."""
+    try:
+        first = conn.execute(f"SELECT MIN(seq) FROM {CHANGELOG_TABLE}").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 1
+    return first if first is not None else last_seq(conn) + 1
+
+
+def pull(conn, after_seq=0, limit=SYNC_BATCH_SIZE):
+    """`after_seq` dan keyingi o'zgarishlar: [(seq, jadval, amal, id, qator), ...]."""
+    rows = conn.execute(f'''
+        SELECT seq, table_name, op, row_id, data FROM {CHANGELOG_TABLE}
+        WHERE seq > ? ORDER BY seq LIMIT ?
+    ''', (after_seq, limit)).fetchall()
+    return [(seq, table, op, row_id, _decode(data)) for seq, table, op, row_id, data in rows]
+
+
+def _decode(data):
+    if data is None:
+        return None
+    row = json.loads(data)
+    for column, value in row.items():
+        if isinstance(value, dict) and "$hex" in value:
+            row[column] = bytes.fromhex(value["$hex"])
+    return row
+
+
+def prune(conn, upto_seq):
+    """Barcha iste'molchilar olib bo'lgan o'zgarishlarni jurnaldan o'chiradi."""
+    with conn:
+        return conn.execute(f"DELETE FROM {CHANGELOG_TABLE} WHERE seq <= ?", (upto_seq,)).rowcount
+
+
+def trim(conn, retention=CHANGELOG_RETENTION):
+    """Jurnalda faqat oxirgi `retention` ta o'zgarishni qoldiradi."""
+    if first_seq(conn) > last_seq(conn) - retention:
+        return 0
+    return prune(conn, last_seq(conn) - retention)
+
+
+def get_checkpoint(target, source):
+    """Manba uchun nazorat nuqtasi yoki None (hali ko'chirilmagan)."""
+    target.execute(f'''
+        CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+            source TEXT PRIMARY KEY,
+            seq INTEGER NOT NULL
+        )
+    ''')
+    row = target.execute(f"SELECT seq FROM {CHECKPOINT_TABLE} WHERE source = ?", (source,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_checkpoint(target, source, seq):
+    target.execute(f'''
+        INSERT INTO {CHECKPOINT_TABLE} (source, seq) VALUES (?, ?)
+        ON CONFLICT(source) DO UPDATE SET seq = excluded.seq
+    ''', (source, seq))
+
+
+def _upsert(target, table, columns, rows):
+    updates = ", ".join(f"{column} = excluded.{column}" for column in columns if column != "id")
+    target.executemany(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT(id) DO UPDATE SET {updates}",
+        rows)
+
+
+def _ensure_table(source, target, table):
+    exists = target.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+    if not exists:
+        sql = source.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()[0]
+        target.execute(sql)
+
+
+def apply(target, changes, source, source_name):
+    """O'zgarishlarni nishon bazaga qo'llaydi va nazorat nuqtasini suradi.
+
+    Hammasi bitta tranzaksiyada bajariladi. Oxirgi qo'llangan `seq` ni
+    qaytaradi.
+    """
+    target.execute("BEGIN")
+    try:
+        ensured = set()
+        for seq, table, op, row_id, row in changes:
+            if table not in ensured:
+                _ensure_table(source, target, table)
+                ensured.add(table)
+            if op == "D":
+                target.execute(f"DELETE FROM {table} WHERE rowid = ?", (row_id,))
+                continue
+            _upsert(target, table, list(row), [list(row.values())])
+        last = changes[-1][0]
+        _set_checkpoint(target, source_name, last)
+        target.commit()
+    except Exception:
+        target.rollback()
+        raise
+    return last
+
+
+def snapshot(source, target, source_name, batch_size=SYNC_BATCH_SIZE):
+    """Kuzatiladigan jadvallarni to'liq nusxalaydi va nazorat nuqtasini qo'yadi.
+
+    Manba bitta o'qish tranzaksiyasida o'qiladi, shuning uchun nusxa va
+    olingan `seq` bir paytga tegishli. Nusxalangan qatorlar sonini qaytaradi.
+    """
+    copied = 0
+    source.execute("BEGIN")
+    try:
+        seq = last_seq(source)
+        target.execute("BEGIN")
+        try:
+            for table in tracked_tables(source):
+                _ensure_table(source, target, table)
+                cursor = source.execute(f"SELECT * FROM {table}")
+                columns = [column[0] for column in cursor.description]
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    _upsert(target, table, columns, rows)
+                    copied += len(rows)
+            _set_checkpoint(target, source_name, seq)
+            target.commit()
+        except Exception:
+            target.rollback()
+            raise
+    finally:
+        source.rollback()
+    return copied
+
+
+def sync(source_db, target_db, batch_size=SYNC_BATCH_SIZE, source_name=None, prune_applied=False):
+    """Manba bazadagi yangi o'zgarishlarni nishon bazaga ko'chiradi.
+
+    Nishonda bu manba uchun nazorat nuqtasi bo'lmasa, avval `snapshot`
+    bajariladi. Kerakli o'zgarishlar jurnaldan o'chirib bo'lingan bo'lsa
+    `ValueError` ko'tariladi. `prune_applied` - qo'llangan o'zgarishlarni
+    manba jurnalidan o'chirish (faqat yagona iste'molchi uchun).
+    (nusxalangan qatorlar, qo'llangan o'zgarishlar) sonini qaytaradi.
+    """
+    source_name = source_name or os.path.basename(source_db)
+    source = sqlite3.connect(source_db)
+    target = sqlite3.connect(target_db)
+    copied = applied = 0
+    try:
+        seq = get_checkpoint(target, source_name)
+        target.commit()
+        if seq is None:
+            copied = snapshot(source, target, source_name, batch_size)
+            seq = get_checkpoint(target, source_name)
+        elif first_seq(source) > seq + 1:
+            raise ValueError(f"{source_name}: {seq + 1}-{first_seq(source) - 1} o'zgarishlar jurnaldan "
+                             "o'chirilgan, nishonni qaytadan yarating")
+        while True:
+            changes = pull(source, seq, batch_size)
+            if not changes:
+                break
+            seq = apply(target, changes, source, source_name)
+            applied += len(changes)
+        if prune_applied:
+            prune(source, seq)
+    finally:
+        source.close()
+        target.close()
+    return copied, applied
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="O'zgarishlarni boshqa SQLite bazaga ko'chirish")
+    parser.add_argument("source")
+    parser.add_argument("target")
+    parser.add_argument("--batch-size", type=int, default=SYNC_BATCH_SIZE)
+    parser.add_argument("--prune", action="store_true",
+                        help="qo'llangan o'zgarishlarni manba jurnalidan o'chirish (yagona iste'molchi)")
+    args = parser.parse_args(argv)
+    try:
+        copied, applied = sync(args.source, args.target, args.batch_size, prune_applied=args.prune)
+    except ValueError as error:
+        print(f"Xatolik: {error}", file=sys.stderr)
+        return 1
+    if copied:
+        print(f"{copied} ta qator to'liq nusxalandi.")
+    print(f"{applied} ta o'zgarish ko'chirildi.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""Jadvallarni ustunli (columnar) fayllarga eksport qilish.
+
+Jadval kalit bo'yicha bo'laklab o'qiladi va har bir ustun alohida faylga
+yoziladi:
+
+* INTEGER ustunlar - `int64` massiv (+ NULL lar uchun `uint8` niqob),
+* REAL ustunlar - `float64` massiv (NULL -> NaN),
+* kam qiymatli matnlar (jinsi, millati, fakultet...) - lug'at kodlari
+  (`int32`, NULL -> -1) va lug'atning o'zi `schema.json` da,
+* qolgan matnlar - Arrow uslubida `int64` siljishlar va UTF-8 baytlar.
+
+SQLite ustun turini majburlamaydi, shuning uchun eksportdan oldin sonli
+ustunlardagi qiymat turlari (`typeof`) tekshiriladi: INTEGER ustunda kasr
+son bo'lsa `float64`, matn yoki BLOB bo'lsa `utf8` sifatida yoziladi.
+
+`open_table` fayllarni `numpy.memmap` orqali nusxa ko'chirmasdan ochadi.
+
+Misol::
+
+    python columnar_export.py student eksport/student
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+import numpy as np
+
+import inson_shards
+from main import db_file_path, iter_pages, BATCH_SIZE, TABLE_DATABASES
+
+DICTIONARY_COLUMNS = {"jinsi", "millati", "fakultet", "oliy_oquv_yurti"}
+SCHEMA_FILE = "schema.json"
+
+
+def column_kind(declared_type, name, dictionary_columns):
+    declared_type = (declared_type or "").upper()
+    if "INT" in declared_type:
+        return "int64"
+    if any(word in declared_type for word in ("REAL", "FLOA", "DOUB")):
+        return "float64"
+    if name in dictionary_columns:
+        return "dictionary"
+    return "utf8"
+
+
+def stored_kinds(files, table, kinds):
+    """Sonli ustunlar turini ulardagi haqiqiy qiymatlarga moslaydi.
+
+    Barcha fayllar bitta so'rov bilan (har biri bir marta) o'qiladi.
+    """
+    numeric = [name for name, kind in kinds.items() if kind in ("int64", "float64")]
+    if not numeric:
+        return kinds
+    checks = ", ".join(f"MAX(typeof({name}) = 'real'), MAX(typeof({name}) IN ('text', 'blob'))"
+                       for name in numeric)
+    found = [0] * (2 * len(numeric))
+    for path in files:
+        conn = sqlite3.connect(path)
+        try:
+            row = conn.execute(f"SELECT {checks} FROM {table}").fetchone()
+        except sqlite3.OperationalError:
+            # asosiy faylda jadval bo'lmasligi mumkin (bo'laklangan inson)
+            continue
+        finally:
+            conn.close()
+        found = [max(old, new or 0) for old, new in zip(found, row)]
+    kinds = dict(kinds)
+    for index, name in enumerate(numeric):
+        has_real, has_text = found[2 * index], found[2 * index + 1]
+        if has_text:
+            kinds[name] = "utf8"
+        elif has_real and kinds[name] == "int64":
+            kinds[name] = "float64"
+    return kinds
+
+
+class _ColumnWriter:
+    """Bitta ustun fayllariga bo'laklab yozuvchi."""
+
+    def __init__(self, out_dir, name, kind):
+        self.name = name
+        self.kind = kind
+        self.has_nulls = False
+        self.files = {}
+        base = os.path.join(out_dir, name)
+        if kind in ("int64", "float64"):
+            self.files["values"] = open(f"{base}.{kind}", "wb")
+        if kind in ("int64", "utf8"):
+            self.files["valid"] = open(f"{base}.valid.uint8", "wb")
+        if kind == "dictionary":
+            self.files["codes"] = open(f"{base}.codes.int32", "wb")
+            self.dictionary = {}
+        if kind == "utf8":
+            self.files["offsets"] = open(f"{base}.offsets.int64", "wb")
+            self.files["data"] = open(f"{base}.data.utf8", "wb")
+            self.position = 0
+            np.zeros(1, dtype=np.int64).tofile(self.files["offsets"])
+
+    def write(self, values):
+        valid = np.fromiter((value is not None for value in values), dtype=np.uint8, count=len(values))
+        self.has_nulls = self.has_nulls or not valid.all()
+        if self.kind == "int64":
+            np.array([0 if value is None else value for value in values], dtype=np.int64).tofile(self.files["values"])
+            valid.tofile(self.files["valid"])
+        elif self.kind == "float64":
+            np.array([np.nan if value is None else value for value in values], dtype=np.float64).tofile(self.files["values"])
+        elif self.kind == "dictionary":
+            codes = [-1 if value is None else self.dictionary.setdefault(str(value), len(self.dictionary))
+                     for value in values]
+            np.array(codes, dtype=np.int32).tofile(self.files["codes"])
+        else:
+            encoded = [b"" if value is None else str(value).encode("utf-8") for value in values]
+            lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+            (self.position + np.cumsum(lengths)).tofile(self.files["offsets"])
+            self.position += int(lengths.sum())
+            self.files["data"].write(b"".join(encoded))
+            valid.tofile(self.files["valid"])
+
+    def close(self):
+        """Fayllarni yopadi va ustun tavsifini qaytaradi."""
+        for file in self.files.values():
+            file.close()
+        files = {part: os.path.basename(file.name) for part, file in self.files.items()}
+        if "valid" in files and not self.has_nulls:
+            os.remove(self.files["valid"].name)
+            del files["valid"]
+        description = {"name": self.name, "kind": self.kind, "files": files}
+        if self.kind == "dictionary":
+            description["dictionary"] = list(self.dictionary)
+        return description
+
+
+def export_table(table, out_dir, db_name=None, chunk_size=BATCH_SIZE, dictionary_columns=DICTIONARY_COLUMNS):
+    """Jadvalni `out_dir` papkasiga ustunli fayllar ko'rinishida yozadi.
+
+    Xotirada bir vaqtda faqat bitta bo'lak bo'ladi. Eksport qilingan
+    qatorlar sonini qaytaradi.
+    """
+    db_name = db_name or db_file_path(TABLE_DATABASES[table])
+    sharded = table == "inson" and inson_shards.is_sharded(db_name)
+    # Bo'laklangan rejimda sxema birinchi bo'lakdan olinadi
+    conn = sqlite3.connect(inson_shards.shard_files(db_name)[0] if sharded else db_name)
+    info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    if not info:
+        conn.close()
+        raise ValueError(f"Jadval topilmadi: {table}")
+    kinds = {column[1]: column_kind(column[2], column[1], dictionary_columns) for column in info}
+    kinds = stored_kinds(inson_shards.table_files(db_name) if sharded else [db_name], table, kinds)
+    os.makedirs(out_dir, exist_ok=True)
+    writers = [_ColumnWriter(out_dir, name, kind) for name, kind in kinds.items()]
+    if sharded:
+        pages = inson_shards.iter_record_pages(db_name, chunk_size)
+    else:
+        pages = iter_pages(conn, table, chunk_size)
+    rows = 0
+    try:
+        for page in pages:
+            for writer, values in zip(writers, zip(*page)):
+                writer.write(values)
+            rows += len(page)
+    finally:
+        columns = [writer.close() for writer in writers]
+        conn.close()
+    with open(os.path.join(out_dir, SCHEMA_FILE), "w", encoding="utf-8") as file:
+        json.dump({"table": table, "rows": rows, "columns": columns}, file, ensure_ascii=False, indent=2)
+    return rows
+
+
+class DictionaryColumn:
+    """Lug'at bilan kodlangan ustun: `codes` (memmap) va `dictionary`."""
+
+    def __init__(self, codes, dictionary):
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        code = self.codes[index]
+        return None if code < 0 else self.dictionary[code]
+
+    def decode(self):
+        """To'liq satrlar massivi (NULL -> None)."""
+        values = np.array(self.dictionary + [None], dtype=object)
+        return values[self.codes]
+
+
+class StringColumn:
+    """Siljishlar va UTF-8 baytlar ko'rinishidagi matn ustuni."""
+
+    def __init__(self, offsets, data, valid=None):
+        self.offsets = offsets
+        self.data = data
+        self.valid = valid
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if self.valid is not None and not self.valid[index]:
+            return None
+        return bytes(self.data[self.offsets[index]:self.offsets[index + 1]]).decode("utf-8")
+
+
+def _map(path, dtype, rows):
+    if rows == 0 or os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+def open_table(out_dir):
+    """Eksport qilingan jadvalni ochadi: {ustun: massiv yoki ustun obyekti}."""
+    with open(os.path.join(out_dir, SCHEMA_FILE), encoding="utf-8") as file:
+        schema = json.load(file)
+    rows = schema["rows"]
+    result = {}
+    for column in schema["columns"]:
+        files = {part: os.path.join(out_dir, name) for part, name in column["files"].items()}
+        valid = _map(files["valid"], np.uint8, rows).view(bool) if "valid" in files else None
+        if column["kind"] in ("int64", "float64"):
+            values = _map(files["values"], column["kind"], rows)
+            result[column["name"]] = values if valid is None else np.ma.MaskedArray(values, mask=~valid)
+        elif column["kind"] == "dictionary":
+            result[column["name"]] = DictionaryColumn(_map(files["codes"], np.int32, rows), column["dictionary"])
+        else:
+            offsets = np.memmap(files["offsets"], dtype=np.int64, mode="r")
+            result[column["name"]] = StringColumn(offsets, _map(files["data"], np.uint8, rows), valid)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Jadvalni ustunli fayllarga eksport qilish")
+    parser.add_argument("table", choices=sorted(TABLE_DATABASES))
+    parser.add_argument("out_dir")
+    parser.add_argument("--db", help="baza fayli (standart: all_databas dagi fayl)")
+    parser.add_argument("--dictionary", help="lug'at bilan kodlanadigan ustunlar (vergul bilan)")
+    args = parser.parse_args(argv)
+    dictionary = set(args.dictionary.split(",")) if args.dictionary else DICTIONARY_COLUMNS
+    rows = export_table(args.table, args.out_dir, args.db, dictionary_columns=dictionary)
+    print(f"{args.table}: {rows} qator {args.out_dir} ga eksport qilindi.")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
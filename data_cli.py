@@ -0,0 +1,312 @@
+"""Jadvallarni CSV/JSONL fayllarga eksport va import qilish.
+
+Ma'lumotlar bo'laklab oqim ko'rinishida o'qiladi va yoziladi, shuning uchun
+xotira sarfi jadval hajmiga bog'liq emas. Fayl nomi `.gz` bilan tugasa
+gzip ishlatiladi, `-` - stdin/stdout. Jarayon stderr ga chiqariladi.
+
+Misollar::
+
+    python data_cli.py export student talabalar.csv.gz
+    python data_cli.py import inson odamlar.jsonl --db boshqa.db
+    python data_cli.py export users - --format jsonl | head
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import inson_shards
+import row_counter
+from main import BATCH_SIZE, TABLE_DATABASES, connect, db_file_path, iter_chunks, iter_pages, load_module
+
+# Sana ustunlari: import paytida YYYY-MM-DD formatida tekshiriladi
+DATE_COLUMNS = {
+    "inson": ("tugilgan_sana",),
+    "ticher": ("tugilgan_sanasi",),
+    "student": ("tugilgan_sana",),
+    "students": ("birth_date",),
+}
+# Faylda bo'lmasa import vaqti bilan to'ldiriladigan ustunlar
+SAVED_AT_COLUMNS = {
+    "inson": "saqlangan_vaqt",
+    "ticher": "saqlangan_vaqti",
+}
+FORMATS = ("csv", "jsonl")
+# Bo'laklangan inson ga yozishda kerak bo'ladigan ustunlar (add_records tartibida)
+INSON_RECORD_COLUMNS = ("familya", "ism", "otasi_ismi", "jinsi", "millati", "boyi", "tugilgan_sana")
+
+
+def ensure_table(table, db_name):
+    """Jadval bo'lmasa, uni o'z moduli orqali (triggerlari bilan) yaratadi."""
+    if table == "inson":
+        load_module("inson_db.py").DatabaseManager(db_name).close_connection()
+    elif table == "ticher":
+        load_module("ticher_db.py").UsersDatabase(db_name).close_connection()
+    elif table == "student":
+        load_module("student_db.py").StudentDatabase(db_name).close_connection()
+    else:
+        load_module("K.KID_AU_23_db.py").UniversityApp(db_name).db.close()
+
+
+def table_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith(".jsonl") or name.endswith(".ndjson"):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    raise ValueError(f"Fayl formatini aniqlab bo'lmadi: {path} (--format bering)")
+
+
+@contextmanager
+def open_text(path, mode):
+    """Faylni matn rejimida ochadi (`.gz` - gzip, `-` - stdin/stdout).
+
+    stdin/stdout yopilmaydi: o'ram ishdan keyin ajratib olinadi (detach).
+    """
+    if path == "-":
+        stream = sys.stdin.buffer if mode == "r" else sys.stdout.buffer
+        file = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        try:
+            yield file
+        finally:
+            file.detach()
+        return
+    if path.endswith(".gz"):
+        file = gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    else:
+        file = open(path, mode, encoding="utf-8", newline="")
+    with file:
+        yield file
+
+
+class Progress:
+    """stderr ga jarayon holatini (ko'pi bilan `interval` soniyada bir marta) chiqaradi."""
+
+    def __init__(self, label, total=None, stream=sys.stderr, interval=0.5):
+        self.label = label
+        self.total = total
+        self.stream = stream
+        self.interval = interval
+        self.done = 0
+        self.started = self.shown = time.perf_counter()
+
+    def update(self, count):
+        self.done += count
+        now = time.perf_counter()
+        if now - self.shown >= self.interval:
+            self.shown = now
+            self.show(now)
+
+    def show(self, now):
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        of_total = f"/{self.total}" if self.total is not None else ""
+        self.stream.write(f"\r{self.label}: {self.done}{of_total} qator ({rate:.0f} qator/soniya)")
+        self.stream.flush()
+
+    def finish(self):
+        self.show(time.perf_counter())
+        self.stream.write("\n")
+        self.stream.flush()
+
+
+def export_table(table, path, fmt=None, db_name=None, chunk_size=BATCH_SIZE):
+    """Jadvalni CSV yoki JSONL faylga yozadi. Yozilgan qatorlar sonini qaytaradi."""
+    fmt = detect_format(path, fmt)
+    db_name = db_name or db_file_path(TABLE_DATABASES[table])
+    conn = sqlite3.connect(db_name)
+    columns = table_columns(conn, table)
+    if not columns:
+        conn.close()
+        raise ValueError(f"Jadval topilmadi: {table}")
+    if table == "inson" and inson_shards.is_sharded(db_name):
+        # Bo'laklangan rejim: asosiy fayl va bo'laklar id tartibida birlashtiriladi
+        total = 0
+        for path_name in inson_shards.table_files(db_name):
+            part = sqlite3.connect(path_name)
+            total += row_counter.get_count(part, table)
+            part.close()
+        pages = inson_shards.iter_record_pages(db_name, chunk_size)
+    else:
+        total = row_counter.get_count(conn, table)
+        pages = iter_pages(conn, table, chunk_size)
+    progress = Progress(f"{table} eksport", total)
+    try:
+        with open_text(path, "w") as file:
+            if fmt == "csv":
+                writer = csv.writer(file)
+                writer.writerow(columns)
+            for page in pages:
+                if fmt == "csv":
+                    writer.writerows(page)
+                else:
+                    file.writelines(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n"
+                                    for row in page)
+                progress.update(len(page))
+    finally:
+        progress.finish()
+        conn.close()
+    return progress.done
+
+
+def read_records(file, fmt):
+    """Fayldagi yozuvlarni lug'at ko'rinishida birma-bir qaytaradi."""
+    if fmt == "csv":
+        for record in csv.DictReader(file):
+            # CSV da NULL bo'sh satr sifatida yoziladi
+            yield {key: (value if value != "" else None) for key, value in record.items()}
+    else:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def invalid_dates(conn, values):
+    """Bo'lakdagi noto'g'ri sanalar indekslarini SQLite `date()` bilan topadi.
+
+    Butun bo'lak bitta so'rovda tekshiriladi: `date(x, '+0 days')` faqat
+    mavjud YYYY-MM-DD sana uchun o'zini qaytaradi (2001-02-30 -> 2001-03-02).
+    NULL qiymatlar o'tkaziladi.
+    """
+    rows = conn.execute(
+        "SELECT key FROM json_each(?) WHERE value IS NOT NULL AND date(value, '+0 days') IS NOT value",
+        (json.dumps(values),))
+    return {row[0] for row in rows}
+
+
+def import_table(table, path, fmt=None, db_name=None, chunk_size=BATCH_SIZE, keep_ids=False, skip_invalid=False):
+    """CSV yoki JSONL faylni jadvalga bo'laklab, tranzaksiyalar ichida yozadi.
+
+    Har bir bo'lakdagi sanalar bitta so'rov bilan tekshiriladi. Noto'g'ri
+    sana topilsa, `skip_invalid` bo'lmasa `ValueError` ko'tariladi (oldingi
+    bo'laklar saqlanib qoladi). (yozilgan, tashlab ketilgan) sonlarni qaytaradi.
+    """
+    fmt = detect_format(path, fmt)
+    db_name = db_name or db_file_path(TABLE_DATABASES[table])
+    ensure_table(table, db_name)
+    sharded = None
+    if table == "inson" and inson_shards.is_sharded(db_name):
+        if keep_ids:
+            raise ValueError("Bo'laklangan inson ga id lar bilan import qilib bo'lmaydi (--keep-ids)")
+        # id lar umumiy hisoblagichdan olinishi va kerakli bo'lakka tushishi uchun
+        sharded = inson_shards.ShardedDatabaseManager(
+            db_name, "bulk-load", shards=len(inson_shards.shard_files(db_name)))
+    conn = connect(db_name, "bulk-load")
+    columns = table_columns(conn, table)
+    date_columns = DATE_COLUMNS.get(table, ())
+    saved_at = SAVED_AT_COLUMNS.get(table)
+    skipped = 0
+    progress = Progress(f"{table} import")
+    try:
+        with open_text(path, "r") as file:
+            records = read_records(file, fmt)
+            first = next(records, None)
+            if first is None:
+                return 0, 0
+            fields = [column for column in columns if column in first and (keep_ids or column != "id")]
+            unknown = set(first) - set(columns)
+            if unknown:
+                raise ValueError(f"Jadvalda bunday ustunlar yo'q: {', '.join(sorted(unknown))}")
+            fill_saved_at = saved_at is not None and saved_at not in fields
+            insert_columns = fields + [saved_at] if fill_saved_at else fields
+            query = (f"INSERT INTO {table} ({', '.join(insert_columns)}) "
+                     f"VALUES ({', '.join('?' * len(insert_columns))})")
+            checked = [fields.index(column) for column in date_columns if column in fields]
+            if sharded is not None:
+                missing = set(INSON_RECORD_COLUMNS) - set(fields)
+                if missing:
+                    raise ValueError(f"Faylda ustunlar yetishmaydi: {', '.join(sorted(missing))}")
+                positions = [fields.index(column) for column in INSON_RECORD_COLUMNS]
+            line = 1 if fmt == "jsonl" else 2
+            for chunk in iter_chunks(_chain(first, records), chunk_size):
+                rows = [[record.get(column) for column in fields] for record in chunk]
+                bad = set()
+                for index in checked:
+                    bad |= invalid_dates(conn, [row[index] for row in rows])
+                if bad:
+                    if not skip_invalid:
+                        numbers = ", ".join(str(line + i) for i in sorted(bad)[:10])
+                        raise ValueError(f"Noto'g'ri sana (YYYY-MM-DD kerak), qatorlar: {numbers}")
+                    skipped += len(bad)
+                    rows = [row for i, row in enumerate(rows) if i not in bad]
+                if sharded is not None:
+                    sharded.add_records([[row[i] for i in positions] for row in rows], chunk_size)
+                    line += len(chunk)
+                    progress.update(len(rows))
+                    continue
+                if fill_saved_at:
+                    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    for row in rows:
+                        row.append(now)
+                try:
+                    conn.execute("BEGIN")
+                    conn.executemany(query, rows)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                line += len(chunk)
+                progress.update(len(rows))
+    finally:
+        progress.finish()
+        conn.close()
+        if sharded is not None:
+            sharded.close_connection()
+    return progress.done, skipped
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Jadvallarni CSV/JSONL ga eksport va import qilish")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("export", "import"):
+        command = commands.add_parser(name)
+        command.add_argument("table", choices=sorted(TABLE_DATABASES))
+        command.add_argument("path", help="fayl yo'li (.gz - gzip, '-' - stdin/stdout)")
+        command.add_argument("--format", choices=FORMATS)
+        command.add_argument("--db", help="baza fayli (standart: all_databas dagi fayl)")
+        command.add_argument("--chunk-size", type=int, default=BATCH_SIZE)
+        if name == "import":
+            command.add_argument("--keep-ids", action="store_true", help="fayldagi id larni saqlash")
+            command.add_argument("--skip-invalid", action="store_true",
+                                 help="noto'g'ri sanali qatorlarni tashlab ketish")
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "export":
+            count = export_table(args.table, args.path, args.format, args.db, args.chunk_size)
+            print(f"{count} qator eksport qilindi.", file=sys.stderr)
+        else:
+            count, skipped = import_table(args.table, args.path, args.format, args.db, args.chunk_size,
+                                          args.keep_ids, args.skip_invalid)
+            print(f"{count} qator import qilindi, {skipped} ta tashlab ketildi.", file=sys.stderr)
+    except BrokenPipeError:
+        # O'quvchi (masalan `| head`) oqimni yopdi: qolgan chiqishni jim tashlab yuboramiz
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+        return 0
+    except (ValueError, sqlite3.Error) as error:
+        print(f"Xatolik: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
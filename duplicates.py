@@ -0,0 +1,333 @@
+"""inson, ticher va student jadvallaridagi takroriy odamlarni topish.
+
+Bir odam turli jadvallarda familya/ism/otasining ismi biroz boshqacha
+yozilgan holda, lekin bir xil tug'ilgan sana bilan uchraydi. Hamma juftlarni
+solishtirish kvadratik bo'lgani uchun:
+
+1. har bir yozuvga blok kaliti beriladi - normallangan familya boshi va
+   tug'ilgan sana xeshi; yozuvlar vaqtinchalik SQLite faylga yoziladi
+   (xotira jadval hajmiga bog'liq bo'lmaydi),
+2. faqat bitta blok ichidagi juftlar Jaro-Winkler o'xshashligi bilan
+   baholanadi, bloklar jarayonlar hovuzida parallel ishlanadi,
+3. mos kelgan juftlar union-find bilan klasterlarga birlashtiriladi va
+   `duplicate_clusters` jadvaliga yoziladi.
+
+Misol::
+
+    python duplicates.py --workers 4
+"""
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+import unicodedata
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from itertools import groupby
+
+import inson_shards
+from federated_db import PEOPLE_COLUMNS
+from main import BATCH_SIZE, TABLE_DATABASES, connect, db_file_path
+
+SOURCES = ("inson", "ticher", "student")
+CLUSTERS_TABLE = "duplicate_clusters"
+# Familya boshidan blok kalitiga olinadigan harflar soni
+PREFIX_LENGTH = 4
+# Juftlik takror hisoblanadigan eng kichik o'xshashlik
+THRESHOLD = 0.9
+# Bundan katta bloklar ism bosh harfi bo'yicha qo'shimcha bo'linadi
+MAX_BLOCK_SIZE = 500
+# Bitta ishchi vazifasidagi taxminiy yozuvlar soni
+TASK_SIZE = 5000
+# Maydonlar og'irligi: familya, ism, otasining ismi
+WEIGHTS = (0.45, 0.35, 0.2)
+
+# Lotin yozuvidagi bir xil tovushning turli yozilishlari
+_REPLACEMENTS = [("x", "h")]
+# O'zbek kirill yozuvi -> lotin (kirill va lotinda yozilgan nomlar bir blokka tushishi uchun)
+_CYRILLIC = str.maketrans({
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo", "ж": "j", "з": "z",
+    "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p", "р": "r",
+    "с": "s", "т": "t", "у": "u", "ф": "f", "х": "x", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sh",
+    "ъ": "", "ь": "", "э": "e", "ю": "yu", "я": "ya", "ў": "o'", "қ": "q", "ғ": "g'", "ҳ": "h",
+})
+# Kirill "е" so'z boshida va unlidan keyin lotinda "ye" bo'ladi (Алиев -> Aliyev)
+_CYRILLIC_YE = re.compile(r"(?<![бвгджзйклмнпрстфхцчшщқғҳ])е")
+_APOSTROPHES = str.maketrans("", "", "'ʻʼ‘’`")
+# Harf bo'lmagan hamma narsa (Unicode bo'yicha): bo'shliq, tinish belgilari, raqamlar, urg'ular
+_NOT_LETTER = re.compile(r"[\W\d_]+")
+_PATRONYMIC = re.compile(r"\s+(o'g'li|ogli|qizi)$")
+
+
+def normalize(value):
+    """Nomni solishtirish uchun soddalashtiradi.
+
+    Unicode casefold, kirilldan lotinga o'girish, apostrof va harf
+    bo'lmagan belgilarni olib tashlash (lotin bo'lmagan harflar saqlanadi).
+    """
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFC", value.strip().casefold())
+    value = _CYRILLIC_YE.sub("ye", value).translate(_CYRILLIC)
+    value = _PATRONYMIC.sub("", value).translate(_APOSTROPHES)
+    value = _NOT_LETTER.sub("", unicodedata.normalize("NFKD", value))
+    for old, new in _REPLACEMENTS:
+        value = value.replace(old, new)
+    return value
+
+
+def block_key(familya, tugilgan_sana):
+    """Familya boshi + tug'ilgan sana xeshi (64 bitli butun son)."""
+    text = f"{familya[:PREFIX_LENGTH]}|{tugilgan_sana}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(text, digest_size=8).digest(), "big", signed=True)
+
+
+@lru_cache(maxsize=1 << 16)
+def jaro_winkler(a, b):
+    """Ikki satr o'xshashligi (0..1).
+
+    Ismlar va familyalar ko'p takrorlanadi, shuning uchun natijalar keshlanadi.
+    """
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    window = max(len(a), len(b)) // 2 - 1
+    matched_b = [False] * len(b)
+    matches_a = []
+    for i, char in enumerate(a):
+        for j in range(max(0, i - window), min(len(b), i + window + 1)):
+            if not matched_b[j] and b[j] == char:
+                matched_b[j] = True
+                matches_a.append(char)
+                break
+    if not matches_a:
+        return 0.0
+    matches_b = [char for char, used in zip(b, matched_b) if used]
+    transpositions = sum(x != y for x, y in zip(matches_a, matches_b)) / 2
+    m = len(matches_a)
+    jaro = (m / len(a) + m / len(b) + (m - transpositions) / m) / 3
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * 0.1 * (1 - jaro)
+
+
+def score(left, right):
+    """Ikki yozuv (familya, ism, otasi) o'xshashligi; bo'sh maydonlar hisobga olinmaydi."""
+    total = weight = 0.0
+    for field_weight, x, y in zip(WEIGHTS, left, right):
+        if x and y:
+            total += field_weight * jaro_winkler(x, y)
+            weight += field_weight
+    return total / weight if weight else 0.0
+
+
+def score_blocks(blocks, threshold=THRESHOLD):
+    """Bloklar ichidagi juftlarni baholaydi (ishchi jarayonda ishlaydi).
+
+    Har bir blok - (manba, id, familya, ism, otasi) yozuvlari ro'yxati.
+    Mos kelgan ((manba, id), (manba, id), ball) juftlarni qaytaradi.
+    """
+    matches = []
+    for block in blocks:
+        for i, left in enumerate(block):
+            for right in block[i + 1:]:
+                value = score(left[2:], right[2:])
+                if value >= threshold:
+                    matches.append((left[:2], right[:2], value))
+    return matches
+
+
+def _split_block(block):
+    if len(block) <= MAX_BLOCK_SIZE:
+        return [block]
+    block = sorted(block, key=lambda row: row[3][:1])
+    return [list(group) for _, group in groupby(block, key=lambda row: row[3][:1])]
+
+
+def stage_records(staging, sources=SOURCES, db_names=None):
+    """Manba jadvallarini normallab, blok kalitlari bilan staging bazaga yozadi."""
+    db_names = db_names or {}
+    staging.execute("""
+        CREATE TABLE records (
+            block INTEGER NOT NULL, manba TEXT NOT NULL, id INTEGER NOT NULL,
+            familya TEXT, ism TEXT, otasi TEXT
+        )
+    """)
+    staged = 0
+    for table in sources:
+        familya, ism, otasi, _, _, tugilgan_sana = PEOPLE_COLUMNS[table]
+        db_name = db_names.get(table) or db_file_path(TABLE_DATABASES[table])
+        # inson bo'laklangan bo'lsa, asosiy fayl va barcha bo'laklar o'qiladi
+        files = inson_shards.table_files(db_name) if table == "inson" else [db_name]
+        for file_name in files:
+            staged += _stage_file(staging, file_name, table, familya, ism, otasi, tugilgan_sana)
+    staging.execute("CREATE INDEX records_block ON records (block)")
+    return staged
+
+
+def _stage_file(staging, file_name, table, familya, ism, otasi, tugilgan_sana):
+    staged = 0
+    source = sqlite3.connect(file_name)
+    try:
+        cursor = source.execute(
+            f"SELECT id, {familya}, {ism}, {otasi}, {tugilgan_sana} FROM {table} "
+            f"WHERE {tugilgan_sana} IS NOT NULL")
+    except sqlite3.OperationalError:
+        source.close()
+        return 0
+    while True:
+        rows = cursor.fetchmany(BATCH_SIZE)
+        if not rows:
+            break
+        staged_rows = []
+        for id, fam, first, father, born in rows:
+            fam = normalize(fam)
+            staged_rows.append((block_key(fam, born), table, id, fam, normalize(first), normalize(father)))
+        with staging:
+            staging.executemany("INSERT INTO records VALUES (?, ?, ?, ?, ?, ?)", staged_rows)
+        staged += len(rows)
+    source.close()
+    return staged
+
+
+def iter_tasks(staging):
+    """Staging bazadan bloklarni o'qib, ~TASK_SIZE yozuvli vazifalarga yig'adi."""
+    cursor = staging.execute("SELECT block, manba, id, familya, ism, otasi FROM records ORDER BY block")
+    rows = iter(lambda: cursor.fetchmany(BATCH_SIZE), [])
+    task, size = [], 0
+    for _, group in groupby((row for chunk in rows for row in chunk), key=lambda row: row[0]):
+        block = [row[1:] for row in group]
+        if len(block) < 2:
+            continue
+        for part in _split_block(block):
+            if len(part) > 1:
+                task.append(part)
+                size += len(part)
+        if size >= TASK_SIZE:
+            yield task
+            task, size = [], 0
+    if task:
+        yield task
+
+
+class UnionFind:
+    """Klasterlarni birlashtirish uchun disjoint-set."""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, node):
+        self.parent.setdefault(node, node)
+        root = node
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[node] != root:
+            self.parent[node], node = root, self.parent[node]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    def clusters(self):
+        groups = {}
+        for node in self.parent:
+            groups.setdefault(self.find(node), []).append(node)
+        return list(groups.values())
+
+
+def _score_in_parallel(tasks, workers, threshold):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Xotira cheklangan bo'lishi uchun bir vaqtda faqat bir necha vazifa navbatda
+        pending = set()
+        for task in tasks:
+            if len(pending) >= workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(score_blocks, task, threshold))
+        for future in pending:
+            yield future.result()
+
+
+def find_duplicates(sources=SOURCES, db_names=None, target=None, workers=None, threshold=THRESHOLD):
+    """Takrorlarni topib, klasterlarini `target` bazaga yozadi.
+
+    `db_names` - {jadval: baza fayli}, berilmasa `all_databas` dagi fayllar.
+    (ko'rilgan yozuvlar, mos juftlar, klasterlar) sonini qaytaradi.
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    handle, staging_name = tempfile.mkstemp(suffix=".db")
+    os.close(handle)
+    staging = connect(staging_name, "bulk-load")
+    try:
+        staged = stage_records(staging, sources, db_names)
+        tasks = iter_tasks(staging)
+        if workers == 1:
+            results = (score_blocks(task, threshold) for task in tasks)
+        else:
+            results = _score_in_parallel(tasks, workers, threshold)
+        clusters = UnionFind()
+        pairs = 0
+        for matches in results:
+            for left, right, _ in matches:
+                clusters.union(left, right)
+            pairs += len(matches)
+    finally:
+        staging.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(staging_name + suffix):
+                os.remove(staging_name + suffix)
+    groups = clusters.clusters()
+    write_clusters(target or db_file_path("duplicates.db"), groups)
+    elapsed = time.perf_counter() - started
+    print(f"{staged} yozuv, {pairs} mos juftlik, {len(groups)} klaster ({elapsed:.1f} soniya).")
+    return staged, pairs, len(groups)
+
+
+def write_clusters(db_name, groups):
+    """Klasterlarni `duplicate_clusters` jadvaliga (eskisining o'rniga) yozadi."""
+    conn = sqlite3.connect(db_name)
+    with conn:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {CLUSTERS_TABLE} (
+                cluster_id INTEGER NOT NULL,
+                manba TEXT NOT NULL,
+                source_id INTEGER NOT NULL,
+                PRIMARY KEY (manba, source_id)
+            )
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{CLUSTERS_TABLE}_cluster ON {CLUSTERS_TABLE} (cluster_id)")
+        conn.execute(f"DELETE FROM {CLUSTERS_TABLE}")
+        conn.executemany(
+            f"INSERT INTO {CLUSTERS_TABLE} (cluster_id, manba, source_id) VALUES (?, ?, ?)",
+            ((number, manba, id) for number, group in enumerate(groups, start=1) for manba, id in sorted(group)))
+    conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Takroriy odamlarni topish")
+    parser.add_argument("--sources", default=",".join(SOURCES), help="jadvallar (vergul bilan)")
+    parser.add_argument("--target", help="natija bazasi (standart: all_databas/duplicates.db)")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+    sources = [source for source in args.sources.split(",") if source]
+    unknown = set(sources) - set(PEOPLE_COLUMNS)
+    if unknown:
+        parser.error(f"noma'lum jadval: {', '.join(sorted(unknown))}")
+    find_duplicates(sources, target=args.target, workers=args.workers, threshold=args.threshold)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""`all_databas` papkasidagi bazalar ustidan yagona so'rov qatlami.
+
+Loyihaning har bir baza fayli (`main.TABLE_DATABASES`) bitta ulanishga
+fayl nomi bilan (masalan `inson_db`,
+`student_db`, `university`) faqat o'qish uchun ATTACH qilinadi. Shundan
+so'ng turli fayllardagi jadvallarni bitta SQL so'rovda birlashtirish
+(JOIN/UNION) mumkin. Papkada fayl qo'shilsa yoki o'chirilsa ulanishlar
+keyingi so'rovda yangilanadi, jadvallar sxemasi esa `schema_version`
+o'zgarguncha keshda saqlanadi.
+
+`odamlar` vaqtinchalik ko'rinishi inson, ticher, student va students
+jadvallarini umumiy ustunlar bilan birlashtiradi. inson bo'laklangan bo'lsa
+(`inson_shards`), bo'lak fayllari ham (`inson_db_shard0`, ...) asosiy fayl
+bilan birga - hammasi yoki hech biri - ulanadi va ko'rinishga qo'shiladi.
+
+Misol::
+
+    fed = FederatedDatabase()
+    fed.fetch_all('''
+        SELECT t.familya, t.ismi, s.fakultet
+        FROM ticher_db.ticher t
+        JOIN student_db.student s
+          ON s.familya = t.familya AND s.tugilgan_sana = t.tugilgan_sanasi
+    ''')
+"""
+import os
+import pathlib
+import re
+import sqlite3
+import sys
+
+import inson_shards
+from main import PAGE_SIZE, PRAGMA_PROFILES, TABLE_DATABASES, connect, final_dir
+
+# Jadval -> odamlar ko'rinishi ustunlari
+# (familya, ism, otasi_ismi, jinsi, millati, tugilgan_sana)
+PEOPLE_COLUMNS = {
+    "inson": ("familya", "ism", "otasi_ismi", "jinsi", "millati", "tugilgan_sana"),
+    "ticher": ("familya", "ismi", "otasining_ismi", "jinsi", "millati", "tugilgan_sanasi"),
+    "student": ("familya", "ismi", "otasining_ismi", "jinsi", "millati", "tugilgan_sana"),
+    "students": ("last_name", "first_name", "NULL", "NULL", "NULL", "birth_date"),
+}
+PEOPLE_VIEW = "odamlar"
+# Har bir ATTACH qilingan baza uchun alohida qo'llanadigan sozlamalar
+SCHEMA_PRAGMAS = ("cache_size", "mmap_size")
+# Papkadan faqat shu fayllar ulanadi (boshqalari `extra_files` orqali)
+KNOWN_FILES = tuple(dict.fromkeys(TABLE_DATABASES.values()))
+# SQLite da band taxalluslar
+RESERVED_ALIASES = {"main", "temp"}
+# SQLITE_MAX_ATTACHED ning standart qiymati
+MAX_ATTACHED = 10
+
+
+def schema_alias(path):
+    """Fayl nomidan SQL identifikator yasaydi (`inson_db.db` -> `inson_db`)."""
+    alias = re.sub(r"\W", "_", os.path.splitext(os.path.basename(path))[0])
+    return alias if not alias[:1].isdigit() else f"db_{alias}"
+
+
+def attach_limit(conn):
+    """Ulanishga ATTACH qilish mumkin bo'lgan bazalar soni."""
+    if hasattr(conn, "getlimit"):
+        return conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+    return MAX_ATTACHED
+
+
+class FederatedDatabase:
+    """Papkadagi ma'lum SQLite bazalarini bitta ulanishda birlashtiradi.
+
+    Faqat `KNOWN_FILES` va `extra_files` dagi fayllar ulanadi. Ulab bo'lmagan
+    (buzilgan, band taxallusli yoki limitdan ortiq) fayllar o'tkazib yuboriladi
+    va sababi `skipped` da saqlanadi, qolgan bazalar bilan ish davom etadi.
+    """
+
+    def __init__(self, directory=None, profile="read-heavy", extra_files=()):
+        self.directory = directory or final_dir
+        self.profile = profile
+        self.extra_files = tuple(extra_files)
+        self.conn = connect(":memory:", profile, uri=True)
+        self.limit = attach_limit(self.conn)
+        self.skipped = {}
+        self._attached = {}
+        self._schemas = {}
+        self._directory_mtime = None
+        self.refresh()
+
+    def _candidates(self):
+        """Ulanadigan fayllar guruhlari: [{taxallus: yo'l}, ...].
+
+        Guruh birga ulanadi: inson asosiy fayli va uning bo'laklari bitta guruh.
+        """
+        groups, seen = [], set()
+        for name in KNOWN_FILES + self.extra_files:
+            path = name if os.path.isabs(name) else os.path.join(self.directory, name)
+            alias = schema_alias(path)
+            group = {alias: path} if os.path.isfile(path) else {}
+            if name == TABLE_DATABASES["inson"]:
+                for shard in inson_shards.shard_files(path):
+                    group[f"{alias}_{schema_alias(shard)}"] = shard
+            if alias.lower() in RESERVED_ALIASES:
+                self.skipped.update(dict.fromkeys(group.values(), f"band taxallus: {alias}"))
+                continue
+            group = {name: path for name, path in group.items() if name not in seen}
+            if group:
+                seen.update(group)
+                groups.append(group)
+        return groups
+
+    def refresh(self, force=False):
+        """Papka o'zgargan bo'lsa, fayllarni ATTACH/DETACH qiladi."""
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if not force and mtime == self._directory_mtime:
+            return
+        self._directory_mtime = mtime
+        self.skipped = {}
+        groups = self._candidates() if mtime is not None else []
+        files = {alias: path for group in groups for alias, path in group.items()}
+        changed = False
+        for alias in [alias for alias in self._attached if files.get(alias) != self._attached[alias]]:
+            self._detach(alias)
+            changed = True
+        for group in groups:
+            pending = {alias: path for alias, path in group.items() if alias not in self._attached}
+            if not pending:
+                continue
+            changed = True
+            if len(self._attached) + len(pending) > self.limit:
+                reason = f"ATTACH limiti ({self.limit}) tugadi"
+            else:
+                reason = None
+                try:
+                    for alias, path in pending.items():
+                        self._attach(alias, path)
+                except sqlite3.Error as error:
+                    reason = str(error)
+            if reason is not None:
+                # Guruh qisman ulanmaydi (masalan, inson bo'laklarining bir qismi)
+                for alias in group:
+                    if alias in self._attached:
+                        self._detach(alias)
+                self.skipped.update(dict.fromkeys(group.values(), reason))
+        if changed or force:
+            self._create_people_view()
+        if mtime is not None:
+            # ATTACH WAL fayllari (-shm) yaratib, papka vaqtini o'zgartirishi mumkin
+            self._directory_mtime = os.stat(self.directory).st_mtime_ns
+
+    def _attach(self, alias, path):
+        uri = pathlib.Path(path).resolve().as_uri() + "?mode=ro"
+        self.conn.execute("ATTACH DATABASE ? AS " + alias, (uri,))
+        try:
+            # Buzilgan faylni darhol aniqlash uchun sxemasini o'qib ko'ramiz
+            self.conn.execute(f"SELECT COUNT(*) FROM {alias}.sqlite_master").fetchone()
+            settings = PRAGMA_PROFILES[self.profile or "read-heavy"]
+            for name in SCHEMA_PRAGMAS:
+                if name in settings:
+                    self.conn.execute(f"PRAGMA {alias}.{name} = {settings[name]}")
+        except sqlite3.Error:
+            self.conn.execute(f"DETACH DATABASE {alias}")
+            raise
+        self._attached[alias] = path
+
+    def _detach(self, alias):
+        self.conn.execute(f"DETACH DATABASE {alias}")
+        del self._attached[alias]
+        self._schemas.pop(alias, None)
+
+    def databases(self):
+        """ATTACH qilingan bazalar: {taxallus: fayl yo'li}."""
+        self.refresh()
+        return dict(self._attached)
+
+    def schema(self, alias):
+        """Bazadagi jadvallar va ustunlari: {jadval: {ustun: tur}}."""
+        version = self.conn.execute(f"PRAGMA {alias}.schema_version").fetchone()[0]
+        cached = self._schemas.get(alias)
+        if cached and cached[0] == version:
+            return cached[1]
+        tables = {}
+        names = self.conn.execute(
+            f"SELECT name FROM {alias}.sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        ).fetchall()
+        for (name,) in names:
+            info = self.conn.execute(f'PRAGMA {alias}.table_info("{name}")').fetchall()
+            tables[name] = {column[1]: column[2] for column in info}
+        self._schemas[alias] = (version, tables)
+        return tables
+
+    def tables(self):
+        """Jadval -> u joylashgan baza taxallusi (birinchi topilgani)."""
+        return {table: aliases[0] for table, aliases in self.locations().items()}
+
+    def locations(self):
+        """Jadval -> u bor barcha baza taxalluslari (bo'laklar ham)."""
+        self.refresh()
+        located = {}
+        for alias in self._attached:
+            for table in self.schema(alias):
+                located.setdefault(table, []).append(alias)
+        return located
+
+    def qualify(self, table):
+        """`inson` -> `inson_db.inson`."""
+        alias = self.tables().get(table)
+        if alias is None:
+            raise ValueError(f"Jadval topilmadi: {table}")
+        return f"{alias}.{table}"
+
+    def _create_people_view(self):
+        self.conn.execute(f"DROP VIEW IF EXISTS temp.{PEOPLE_VIEW}")
+        located = self.locations()
+        parts = []
+        for table, columns in PEOPLE_COLUMNS.items():
+            familya, ism, otasi_ismi, jinsi, millati, tugilgan_sana = columns
+            for alias in located.get(table, ()):
+                parts.append(
+                    f"SELECT '{table}' AS manba, id, {familya} AS familya, {ism} AS ism, "
+                    f"{otasi_ismi} AS otasi_ismi, {jinsi} AS jinsi, {millati} AS millati, "
+                    f"{tugilgan_sana} AS tugilgan_sana FROM {alias}.{table}")
+        if parts:
+            self.conn.execute(f"CREATE TEMP VIEW {PEOPLE_VIEW} AS " + " UNION ALL ".join(parts))
+
+    def execute(self, query, params=()):
+        """So'rovni barcha bazalar ustida bajaradi va kursor qaytaradi."""
+        self.refresh()
+        return self.conn.execute(query, params)
+
+    def fetch_all(self, query, params=()):
+        return self.execute(query, params).fetchall()
+
+    def find_people(self, familya=None, ism=None, tugilgan_sana=None, limit=PAGE_SIZE):
+        """Barcha bazalardan odamlarni qidiradi: (manba, id, familya, ism, ...)."""
+        conditions, params = [], []
+        for column, value in (("familya", familya), ("ism", ism), ("tugilgan_sana", tugilgan_sana)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return self.fetch_all(f"SELECT * FROM {PEOPLE_VIEW}{where} LIMIT ?", params + [limit])
+
+    def counts(self):
+        """Har bir bazadagi jadvallar qatorlari soni: {`baza.jadval`: son}."""
+        self.refresh()
+        result = {}
+        for alias in self._attached:
+            tables = self.schema(alias)
+            counted = {}
+            if "row_counts" in tables:
+                counted = dict(self.conn.execute(f"SELECT table_name, row_count FROM {alias}.row_counts"))
+            for table in tables:
+                if table == "row_counts" or table.startswith("inson_fts"):
+                    continue
+                if table not in counted:
+                    counted[table] = self.conn.execute(f"SELECT COUNT(*) FROM {alias}.{table}").fetchone()[0]
+                result[f"{alias}.{table}"] = counted[table]
+        return result
+
+    def close(self):
+        self.conn.close()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    fed = FederatedDatabase()
+    for path, reason in fed.skipped.items():
+        print(f"Ogohlantirish: {path} ulanmadi ({reason})", file=sys.stderr)
+    try:
+        if not argv:
+            for name, count in fed.counts().items():
+                print(f"{name}: {count}")
+            return 0
+        for row in fed.fetch_all(" ".join(argv)):
+            print(row)
+    finally:
+        fed.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,17 @@
-import sqlite3
 from datetime import datetime
 import os
-from main import db_file_path
+from main import db_file_path, connect, bulk_insert, iter_pages, page_through, BATCH_SIZE, PAGE_SIZE
+import inson_search
+import row_counter
+import changelog
 class DatabaseManager:
     DB_NAME =db_file_path('inson_db.db')
 
-    def __init__(self):
+    def __init__(self, db_name=None, profile=None, **connect_args):
         """Bazaga ulanish va jadval yaratish."""
-        self.conn = sqlite3.connect(self.DB_NAME)
+        if db_name:
+            self.DB_NAME = db_name
+        self.conn = connect(self.DB_NAME, profile, **connect_args)
         self.cursor = self.conn.cursor()
         self.create_table()
 
@@ -27,6 +31,10 @@ class DatabaseManager:
             )
         ''')
         self.conn.commit()
+        self.search_enabled = inson_search.create_search_index(self.conn)
+        inson_search.create_query_indexes(self.conn)
+        row_counter.install_counter(self.conn, "inson")
+        changelog.install(self.conn, "inson")
 
     def add_record(self, familya, ism, otasi_ismi, jinsi, millati, boyi, tugilgan_sana):
         """Yangi yozuv qo'shadi."""
@@ -37,6 +45,22 @@ class DatabaseManager:
         ''', (familya, ism, otasi_ismi, jinsi, millati, boyi, tugilgan_sana, saqlangan_vaqt))
         self.conn.commit()
 
+    def add_records(self, records, chunk_size=BATCH_SIZE):
+        """Ko'p yozuvlarni bo'laklab qo'shadi: har bir bo'lak alohida tranzaksiyada.
+
+        Xatolik bo'lsa faqat joriy bo'lak bekor qilinadi, oldingilari saqlanadi.
+
+        `records` - (familya, ism, otasi_ismi, jinsi, millati, boyi, tugilgan_sana)
+        ko'rinishidagi qatorlar iterable'i. (qo'shilgan yozuvlar soni,
+        yozuv/soniya) qaytaradi.
+        """
+        saqlangan_vaqt = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = (tuple(record) + (saqlangan_vaqt,) for record in records)
+        return bulk_insert(self.conn, '''
+            INSERT INTO inson (familya, ism, otasi_ismi, jinsi, millati, boyi, tugilgan_sana, saqlangan_vaqt)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows, chunk_size)
+
     def delete_record(self, record_id):
         """Ma'lumotni ID bo'yicha o'chiradi."""
         self.cursor.execute("DELETE FROM inson WHERE id = ?", (record_id,))
@@ -55,6 +79,15 @@ class DatabaseManager:
         """Barcha yozuvlarni o'qiydi."""
         self.cursor.execute("SELECT * FROM inson")
         return self.cursor.fetchall()
+    def read_record_pages(self, page_size=PAGE_SIZE):
+        """Yozuvlarni id bo'yicha sahifalab qaytaruvchi generator."""
+        return iter_pages(self.conn, "inson", page_size)
+
+    def iter_records(self, page_size=PAGE_SIZE):
+        """Yozuvlarni birma-bir qaytaradi, xotirada faqat bitta sahifa turadi."""
+        for page in self.read_record_pages(page_size):
+            yield from page
+
     def get_all_ids(self):
         """Barcha foydalanuvchi IDlarini olish."""
         self.cursor.execute("SELECT id FROM inson")
@@ -64,18 +97,44 @@ class DatabaseManager:
         return id_list
     def count_records(self):
         """Yozuvlar sonini qaytaradi."""
-        self.cursor.execute("SELECT COUNT(*) FROM inson")
-        return self.cursor.fetchone()[0]
+        return row_counter.get_count(self.conn, "inson")
+    def _search_text(self, column, text):
+        """Matnli maydon bo'yicha qism-satr qidiruvi (imkon bo'lsa FTS orqali)."""
+        if self.search_enabled and inson_search.can_use_index(text):
+            self.cursor.execute(f'''
+                SELECT inson.* FROM inson
+                JOIN {inson_search.FTS_TABLE} fts ON fts.rowid = inson.id
+                WHERE fts.{inson_search.FTS_TABLE} MATCH ?
+                ORDER BY inson.id
+            ''', (inson_search.match_expression(column, text),))
+        else:
+            self.cursor.execute(f"SELECT * FROM inson WHERE {column} LIKE ?", (f"%{text}%",))
+        return self.cursor.fetchall()
+
     def search_by_familya(self, familya):
         """Familya bo'yicha qidirish."""
-        self.cursor.execute("SELECT * FROM inson WHERE familya LIKE ?", (f"%{familya}%",))
-        return self.cursor.fetchall()
+        return self._search_text("familya", familya)
 
     def search_by_ism(self, ism):
         """Ism bo'yicha qidirish."""
-        self.cursor.execute("SELECT * FROM inson WHERE ism LIKE ?", (f"%{ism}%",))
+        return self._search_text("ism", ism)
+
+    def search(self, query):
+        """`inson_search.InsonQuery` dagi barcha mezonlar bo'yicha bitta so'rovda qidirish."""
+        sql, params = query.build(use_index=self.search_enabled)
+        self.cursor.execute(sql, params)
         return self.cursor.fetchall()
 
+    def rebuild_search_index(self):
+        """Qidiruv indeksini mavjud yozuvlardan qayta quradi."""
+        if not self.search_enabled:
+            self.search_enabled = inson_search.create_search_index(self.conn)
+        inson_search.create_query_indexes(self.conn)
+        row_counter.install_counter(self.conn, "inson")
+        if self.search_enabled:
+            inson_search.rebuild_search_index(self.conn)
+        return self.search_enabled
+
     def search_by_jinsi(self, jinsi):
         """Jinsi bo'yicha qidirish."""
         self.cursor.execute("SELECT * FROM inson WHERE jinsi = ?", (jinsi,))
@@ -98,7 +157,14 @@ class DatabaseManager:
 
 # Menyu interfeysi
 def main_menu():
-    db_manager = DatabaseManager()
+    if int(os.environ.get("INSON_SHARDS", 1)) > 1:
+        # Bo'laklangan rejim: yozuvlar bir nechta faylga taqsimlanadi
+        from inson_shards import ShardedDatabaseManager
+        db_manager = ShardedDatabaseManager()
+        if db_manager.migrated:
+            print(f"{db_manager.migrated} ta yozuv asosiy fayldan bo'laklarga ko'chirildi.")
+    else:
+        db_manager = DatabaseManager()
     try:
         while True:
             os.system('color D')
@@ -111,6 +177,7 @@ def main_menu():
             print("6. Jadvladiga ma`lumotlar ids")
             print("7. Dasturdan chiqish")
             print("8. Ma'lumotlarni qidirish")
+            print("9. Qidiruv indeksini qayta qurish")
             choice = input("Tanlovingiz: ")
             if not choice:
                 continue
@@ -173,10 +240,9 @@ def main_menu():
                 print("Ma'lumot muvaffaqiyatli yangilandi!")
 
             elif choice == '4':
-                records = db_manager.read_records()
                 print("\nJadvaldagi barcha ma'lumotlar:")
-                for record in records:
-                    print(record)
+                if not page_through(db_manager.read_record_pages()):
+                    print("Jadvalda ma'lumot yo'q.")
 
             elif choice == '5':
                 count = db_manager.count_records()
@@ -194,6 +260,7 @@ def main_menu():
                 print("3. Jinsi bo'yicha qidirish")
                 print("4. Bo'yi oralig'ida qidirish")
                 print("5. Tug'ilgan sana bo'yicha qidirish")
+                print("6. Bir nechta mezon bo'yicha qidirish")
                 search_choice = input("Qidirish uchun tanlovingiz: ")
 
                 if search_choice == '1':
@@ -224,6 +291,28 @@ def main_menu():
                     if not tugilgan_sana:
                         continue
                     results = db_manager.search_by_tugilgan_sana(tugilgan_sana)
+                elif search_choice == '6':
+                    print("Kerak bo'lmagan mezonni bo'sh qoldiring.")
+                    query = inson_search.InsonQuery()
+                    familya = input("Familya: ")
+                    if familya:
+                        query.familya(familya)
+                    ism = input("Ism: ")
+                    if ism:
+                        query.ism(ism)
+                    jinsi = input("Jinsi (Erkak/Ayol): ")
+                    if jinsi:
+                        query.jinsi(jinsi)
+                    boyi_min = input("Minimal bo'yi (sm): ")
+                    boyi_max = input("Maksimal bo'yi (sm): ")
+                    query.boyi(int(boyi_min) if boyi_min else None, int(boyi_max) if boyi_max else None)
+                    tugilgan_sana = input("Tug'ilgan sana (YYYY-MM-DD): ")
+                    if tugilgan_sana:
+                        query.tugilgan_sana(tugilgan_sana)
+                    limit = input("Natijalar soni chegarasi: ")
+                    if limit:
+                        query.limit(int(limit))
+                    results = db_manager.search(query)
                 else:
                     print("Noto'g'ri tanlov!")
                     continue
@@ -236,6 +325,12 @@ def main_menu():
                 else:
                     print("Hech qanday ma'lumot topilmadi.")
 
+            elif choice == '9':
+                if db_manager.rebuild_search_index():
+                    print("Qidiruv indeksi qayta qurildi!")
+                else:
+                    print("Xato: SQLite FTS5 ni qo'llab-quvvatlamaydi.")
+
             else:
                 print("Noto'g'ri tanlov. Qayta urinib ko'ring.!")
 
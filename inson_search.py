@@ -0,0 +1,236 @@
+"""inson jadvali uchun qidiruv: FTS5 (trigram) indeksi va so'rov quruvchi.
+
+`inson_fts` - tashqi kontentli virtual jadval: matn `inson` jadvalida
+saqlanadi, indeks esa triggerlar orqali avtomatik yangilanib boriladi.
+Trigram tokenizatori `LIKE '%x%'` kabi qism-satr qidiruvini indeks orqali
+bajarishga imkon beradi.
+"""
+import sqlite3
+import sys
+
+FTS_TABLE = "inson_fts"
+# Trigram indeksi kamida 3 belgidan iborat so'rovlarni qidira oladi
+MIN_QUERY_LENGTH = 3
+SEARCH_COLUMNS = ("familya", "ism")
+
+
+def search_index_exists(conn):
+    """Qidiruv indeksi bazada mavjudligini tekshiradi."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).fetchone()
+    return row is not None
+
+
+def create_search_index(conn):
+    """Virtual jadval va triggerlarni yaratadi.
+
+    Jadval yangi yaratilgan bo'lsa mavjud yozuvlar indeksga ko'chiriladi.
+    SQLite FTS5 siz yig'ilgan bo'lsa False qaytaradi.
+    """
+    existed = search_index_exists(conn)
+    try:
+        conn.executescript(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+                familya, ism,
+                content='inson', content_rowid='id',
+                tokenize='trigram'
+            );
+            CREATE TRIGGER IF NOT EXISTS inson_fts_ai AFTER INSERT ON inson BEGIN
+                INSERT INTO {FTS_TABLE}(rowid, familya, ism)
+                VALUES (new.id, new.familya, new.ism);
+            END;
+            CREATE TRIGGER IF NOT EXISTS inson_fts_ad AFTER DELETE ON inson BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, familya, ism)
+                VALUES ('delete', old.id, old.familya, old.ism);
+            END;
+            CREATE TRIGGER IF NOT EXISTS inson_fts_au AFTER UPDATE OF familya, ism ON inson BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, familya, ism)
+                VALUES ('delete', old.id, old.familya, old.ism);
+                INSERT INTO {FTS_TABLE}(rowid, familya, ism)
+                VALUES (new.id, new.familya, new.ism);
+            END;
+        ''')
+    except sqlite3.OperationalError:
+        return False
+    if not existed:
+        rebuild_search_index(conn)
+    return True
+
+
+def rebuild_search_index(conn):
+    """Indeksni `inson` jadvalidagi ma'lumotlar asosida qaytadan quradi."""
+    conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    conn.commit()
+
+
+def match_expression(column, text):
+    """Ustun bo'yicha qism-satr qidiruvi uchun FTS5 MATCH ifodasi."""
+    phrase = text.replace('"', '""')
+    return f'{column} : "{phrase}"'
+
+
+def can_use_index(text):
+    """So'rov trigram indeksi orqali bajarilishi mumkinligini bildiradi."""
+    return len(text) >= MIN_QUERY_LENGTH
+
+
+# Ko'p mezonli qidiruvda rejalashtiruvchi foydalanadigan indekslar
+QUERY_INDEXES = {
+    "idx_inson_jinsi_boyi": "jinsi, boyi",
+    "idx_inson_jinsi_tugilgan_sana": "jinsi, tugilgan_sana",
+    "idx_inson_tugilgan_sana": "tugilgan_sana",
+    "idx_inson_boyi": "boyi",
+}
+INSON_COLUMNS = (
+    "id", "familya", "ism", "otasi_ismi", "jinsi", "millati",
+    "boyi", "tugilgan_sana", "saqlangan_vaqt",
+)
+
+
+def create_query_indexes(conn):
+    """Ko'p mezonli qidiruv uchun tarkibiy indekslarni yaratadi."""
+    for name, columns in QUERY_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON inson ({columns})")
+    conn.commit()
+
+
+class _Descending:
+    """Kamayish tartibida saralash uchun qiymat o'rami."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+class InsonQuery:
+    """inson jadvali uchun mezonlarni birlashtiruvchi so'rov quruvchi.
+
+    Misol::
+
+        query = InsonQuery().familya("ov").jinsi("Erkak").boyi(170, 190)
+        query = query.order_by("boyi", descending=True).limit(20)
+        results = db_manager.search(query)
+    """
+
+    def __init__(self):
+        self._text = []
+        self._where = []
+        self._params = []
+        self._order = []
+        self._limit = None
+
+    def _text_filter(self, column, text):
+        self._text.append((column, text))
+        return self
+
+    def familya(self, familya):
+        """Familyada qism-satr bo'yicha filtr."""
+        return self._text_filter("familya", familya)
+
+    def ism(self, ism):
+        """Ismda qism-satr bo'yicha filtr."""
+        return self._text_filter("ism", ism)
+
+    def jinsi(self, jinsi):
+        """Jinsi bo'yicha aniq filtr."""
+        self._where.append("jinsi = ?")
+        self._params.append(jinsi)
+        return self
+
+    def boyi(self, boyi_min=None, boyi_max=None):
+        """Bo'yi oralig'i bo'yicha filtr (chegaralar ixtiyoriy)."""
+        if boyi_min is not None:
+            self._where.append("boyi >= ?")
+            self._params.append(boyi_min)
+        if boyi_max is not None:
+            self._where.append("boyi <= ?")
+            self._params.append(boyi_max)
+        return self
+
+    def tugilgan_sana(self, sana_from, sana_to=None):
+        """Tug'ilgan sana (yoki sanalar oralig'i) bo'yicha filtr."""
+        if sana_to is None:
+            self._where.append("tugilgan_sana = ?")
+            self._params.append(sana_from)
+        else:
+            self._where.append("tugilgan_sana BETWEEN ? AND ?")
+            self._params.extend((sana_from, sana_to))
+        return self
+
+    def order_by(self, column, descending=False):
+        """Natijalarni saralash tartibi."""
+        if column not in INSON_COLUMNS:
+            raise ValueError(f"Noma'lum maydon: {column}")
+        self._order.append(f"{column} {'DESC' if descending else 'ASC'}")
+        return self
+
+    def limit(self, count):
+        """Natijalar sonini cheklaydi."""
+        self._limit = int(count)
+        return self
+
+    @property
+    def row_limit(self):
+        """`limit` bilan berilgan cheklov (yo'q bo'lsa None)."""
+        return self._limit
+
+    def sort_key(self):
+        """`build` dagi ORDER BY ga mos Python saralash kaliti.
+
+        Bir nechta bazadan olingan tartiblangan natijalarni birlashtirishda
+        (`heapq.merge`) ishlatiladi.
+        """
+        positions = []
+        for order in self._order + ["id ASC"]:
+            column, direction = order.split()
+            positions.append((INSON_COLUMNS.index(column), direction == "DESC"))
+
+        def key(row):
+            return tuple(_Descending(row[i]) if descending else row[i] for i, descending in positions)
+        return key
+
+    def build(self, use_index=True):
+        """(sql, params) juftligini qaytaradi."""
+        where = []
+        params = []
+        indexed = [(c, t) for c, t in self._text if use_index and can_use_index(t)]
+        if indexed:
+            expression = " AND ".join(match_expression(c, t) for c, t in indexed)
+            where.append(f"id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ?)")
+            params.append(expression)
+        for column, text in self._text:
+            if (column, text) not in indexed:
+                where.append(f"{column} LIKE ?")
+                params.append(f"%{text}%")
+        where.extend(self._where)
+        params.extend(self._params)
+
+        sql = "SELECT * FROM inson"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY " + ", ".join(self._order + ["id ASC"])
+        if self._limit is not None:
+            sql += " LIMIT ?"
+            params.append(self._limit)
+        return sql, params
+
+
+if __name__ == "__main__":
+    from main import db_file_path
+
+    db_name = sys.argv[1] if len(sys.argv) > 1 else db_file_path('inson_db.db')
+    connection = sqlite3.connect(db_name)
+    if create_search_index(connection):
+        rebuild_search_index(connection)
+        print(f"Qidiruv indeksi qayta qurildi: {db_name}")
+    else:
+        print("Xato: SQLite FTS5 kengaytmasini qo'llab-quvvatlamaydi.")
+    connection.close()
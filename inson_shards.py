@@ -0,0 +1,299 @@
+"""inson jadvalini bir nechta SQLite fayllarga bo'lib saqlash (sharding).
+
+Har bir yozuv id sining xeshi bo'yicha N ta fayldan biriga tushadi. Fayllar
+asosiy bazaning yonidagi alohida papkada turadi (`all_databas/inson_db_shards/
+shard0.db`, `shard1.db`, ..., umumiy id hisoblagichi - `ids.db`), shuning
+uchun `all_databas` dagi boshqa vositalar ularni oddiy baza deb o'ylamaydi.
+Yozish kerakli faylga yo'naltiriladi, qidiruv va sanash esa oqimlar
+hovuzida barcha fayllarda parallel bajarilib, tartiblangan natijalar
+`heapq.merge` bilan birlashtiriladi.
+
+`ShardedDatabaseManager` ning ochiq API si `inson_db.DatabaseManager`
+bilan bir xil. Menyuda yoqish uchun: `INSON_SHARDS=4 python inson_db.py`.
+
+Ko'chirish: bo'laklangan rejim birinchi marta ochilganda `inson_db.db`
+dagi mavjud yozuvlar id lari saqlangan holda bo'laklarga ko'chiriladi va
+asosiy fayldan o'chiriladi (`migrate`); id hisoblagichi eng katta mavjud
+id dan keyin davom etadi. Bo'laklar soni keyin o'zgartirilmaydi.
+O'qiydigan vositalar (data_cli, columnar_export, duplicates, federated_db)
+`table_files`/`iter_record_pages` orqali asosiy fayl va bo'laklarni
+birga o'qiydi.
+"""
+import heapq
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import chain, islice
+from operator import itemgetter
+
+from main import connect, bulk_insert, iter_chunks, iter_pages, BATCH_SIZE, PAGE_SIZE
+from inson_db import DatabaseManager
+
+SHARD_COUNT = int(os.environ.get("INSON_SHARDS", 4))
+_MASK = (1 << 64) - 1
+_SHARD_FILE = re.compile(r"shard(\d+)\.db$")
+
+
+def shard_dir(db_name=None):
+    """Bo'lak fayllari papkasi: `inson_db.db` -> `inson_db_shards/`."""
+    root, _ = os.path.splitext(db_name or DatabaseManager.DB_NAME)
+    return f"{root}_shards"
+
+
+def shard_files(db_name=None):
+    """Mavjud bo'lak fayllari (raqami bo'yicha tartiblangan)."""
+    directory = shard_dir(db_name)
+    if not os.path.isdir(directory):
+        return []
+    numbered = [(int(match.group(1)), name) for name in os.listdir(directory)
+                for match in [_SHARD_FILE.match(name)] if match]
+    return [os.path.join(directory, name) for _, name in sorted(numbered)]
+
+
+def is_sharded(db_name=None):
+    return bool(shard_files(db_name))
+
+
+def table_files(db_name=None):
+    """inson yozuvlari bo'lishi mumkin bo'lgan barcha fayllar: asosiy fayl va bo'laklar."""
+    db_name = db_name or DatabaseManager.DB_NAME
+    files = [db_name] if os.path.isfile(db_name) else []
+    return files + shard_files(db_name)
+
+
+def _has_inson(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'inson'").fetchone()
+
+
+def iter_record_pages(db_name=None, page_size=PAGE_SIZE):
+    """Asosiy fayl va bo'laklardagi yozuvlarni id tartibida sahifalab o'qiydi."""
+    conns = [sqlite3.connect(path) for path in table_files(db_name)]
+    try:
+        streams = [chain.from_iterable(iter_pages(conn, "inson", page_size)) for conn in conns if _has_inson(conn)]
+        yield from iter_chunks(heapq.merge(*streams, key=itemgetter(0)), page_size)
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+def shard_for(record_id, shards):
+    """id uchun fayl raqami (splitmix64 aralashtirishi bilan)."""
+    value = (record_id + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return (value ^ (value >> 31)) % shards
+
+
+class IdAllocator:
+    """Barcha fayllar uchun umumiy id hisoblagichi.
+
+    id lar bloklab ajratiladi: bitta tranzaksiyada `count` ta id olinadi.
+    """
+
+    def __init__(self, db_name, profile=None):
+        self.conn = connect(db_name, profile, check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS id_sequence (name TEXT PRIMARY KEY, next_id INTEGER NOT NULL)")
+        self.conn.execute("INSERT OR IGNORE INTO id_sequence (name, next_id) VALUES ('inson', 1)")
+        self.conn.commit()
+
+    def ensure_above(self, max_id):
+        """Hisoblagichni `max_id` dan keyingi qiymatga suradi (kamaytirmaydi)."""
+        with self.conn:
+            self.conn.execute("UPDATE id_sequence SET next_id = MAX(next_id, ?) WHERE name = 'inson'",
+                              (max_id + 1,))
+
+    def allocate(self, count=1):
+        """Ketma-ket `count` ta yangi id ning birinchisini qaytaradi."""
+        with self.conn:
+            next_id = self.conn.execute(
+                "UPDATE id_sequence SET next_id = next_id + ? WHERE name = 'inson' RETURNING next_id",
+                (count,)).fetchone()[0]
+        return next_id - count
+
+    def close(self):
+        self.conn.close()
+
+
+class ShardedDatabaseManager(DatabaseManager):
+    """inson yozuvlarini bir nechta fayl bo'ylab taqsimlovchi boshqaruvchi."""
+
+    INSERT_QUERY = '''
+        INSERT INTO inson (id, familya, ism, otasi_ismi, jinsi, millati, boyi, tugilgan_sana, saqlangan_vaqt)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    def __init__(self, db_name=None, profile=None, shards=SHARD_COUNT, workers=None):
+        """Fayllarga ulanadi; har bir faylda jadval va indekslar yaratiladi.
+
+        Asosiy faylda yozuvlar bo'lsa, ular bo'laklarga ko'chiriladi.
+        """
+        if db_name:
+            self.DB_NAME = db_name
+        existing = shard_files(self.DB_NAME)
+        if existing and len(existing) != shards:
+            raise ValueError(f"Bazada {len(existing)} ta bo'lak bor, {shards} ta so'ralgan "
+                             "(bo'laklar sonini o'zgartirib bo'lmaydi)")
+        directory = shard_dir(self.DB_NAME)
+        os.makedirs(directory, exist_ok=True)
+        # Har bir fayl bilan bir vaqtda faqat bitta oqim ishlaydi (bitta vazifa - bitta fayl)
+        self.shards = [DatabaseManager(os.path.join(directory, f"shard{i}.db"), profile, check_same_thread=False)
+                       for i in range(shards)]
+        self.ids = IdAllocator(os.path.join(directory, "ids.db"), profile)
+        self.pool = ThreadPoolExecutor(max_workers=workers or shards)
+        self.create_table()
+        self.ids.ensure_above(max(shard.conn.execute("SELECT IFNULL(MAX(id), 0) FROM inson").fetchone()[0]
+                                  for shard in self.shards))
+        self.migrated = self.migrate()
+
+    def _scatter(self, method, *args):
+        """Metodni barcha fayllarda parallel chaqiradi, natijalar ro'yxatini qaytaradi."""
+        futures = [self.pool.submit(getattr(shard, method), *args) for shard in self.shards]
+        return [future.result() for future in futures]
+
+    def migrate(self, chunk_size=BATCH_SIZE):
+        """Asosiy fayldagi yozuvlarni bo'laklarga ko'chiradi.
+
+        id lar saqlanadi. Bo'lakda shu id li aynan bir xil yozuv bo'lsa, u
+        oldingi (uzilib qolgan) ko'chirishda yozilgan deb hisoblanadi va faqat
+        asosiy fayldan o'chiriladi. Boshqa yozuv bo'lsa (asosiy faylga bo'laklangan
+        rejimdan keyin yozilgan), yozuvga yangi id beriladi. Ko'chirilganlar
+        sonini qaytaradi.
+        """
+        if not os.path.isfile(self.DB_NAME):
+            return 0
+        base = sqlite3.connect(self.DB_NAME)
+        try:
+            if not _has_inson(base):
+                return 0
+            self.ids.ensure_above(base.execute("SELECT IFNULL(MAX(id), 0) FROM inson").fetchone()[0])
+            moved = 0
+            for page in iter_pages(base, "inson", chunk_size):
+                buckets = [[] for _ in self.shards]
+                for row in page:
+                    buckets[shard_for(row[0], len(self.shards))].append(row)
+                for shard, rows in zip(self.shards, buckets):
+                    if not rows:
+                        continue
+                    placeholders = ", ".join("?" * len(rows))
+                    taken = {row[0]: tuple(row) for row in shard.conn.execute(
+                        f"SELECT * FROM inson WHERE id IN ({placeholders})", [row[0] for row in rows])}
+                    fresh = [row for row in rows if row[0] not in taken]
+                    bulk_insert(shard.conn, self.INSERT_QUERY, fresh, chunk_size)
+                    for row in rows:
+                        if row[0] in taken and taken[row[0]] != tuple(row):
+                            record_id = self.ids.allocate()
+                            target = self._shard(record_id)
+                            target.cursor.execute(self.INSERT_QUERY, (record_id,) + tuple(row[1:]))
+                            target.conn.commit()
+                with base:
+                    base.executemany("DELETE FROM inson WHERE id = ?", [(row[0],) for row in page])
+                moved += len(page)
+        finally:
+            base.close()
+        return moved
+
+    def _shard(self, record_id):
+        return self.shards[shard_for(record_id, len(self.shards))]
+
+    @staticmethod
+    def _sorted_by_id(results):
+        return sorted(chain.from_iterable(results), key=itemgetter(0))
+
+    def create_table(self):
+        """Barcha fayllarda jadvallarni yaratadi."""
+        self._scatter("create_table")
+        self.search_enabled = all(shard.search_enabled for shard in self.shards)
+
+    def add_record(self, familya, ism, otasi_ismi, jinsi, millati, boyi, tugilgan_sana):
+        """Yangi yozuv qo'shadi."""
+        record_id = self.ids.allocate()
+        saqlangan_vaqt = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        shard = self._shard(record_id)
+        shard.cursor.execute(self.INSERT_QUERY, (record_id, familya, ism, otasi_ismi, jinsi, millati, boyi,
+                                                 tugilgan_sana, saqlangan_vaqt))
+        shard.conn.commit()
+
+    def add_records(self, records, chunk_size=BATCH_SIZE):
+        """Ko'p yozuvlarni bo'laklab qo'shadi; bo'lak fayllarga parallel yoziladi.
+
+        (qo'shilgan yozuvlar soni, yozuv/soniya) qaytaradi.
+        """
+        saqlangan_vaqt = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        total = 0
+        started = time.perf_counter()
+        for chunk in iter_chunks(records, chunk_size):
+            first_id = self.ids.allocate(len(chunk))
+            buckets = [[] for _ in self.shards]
+            for record_id, record in enumerate(chunk, start=first_id):
+                buckets[shard_for(record_id, len(self.shards))].append(
+                    (record_id,) + tuple(record) + (saqlangan_vaqt,))
+            futures = [self.pool.submit(bulk_insert, shard.conn, self.INSERT_QUERY, rows, chunk_size)
+                       for shard, rows in zip(self.shards, buckets) if rows]
+            total += sum(future.result()[0] for future in futures)
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed > 0 else 0.0
+        return total, rate
+
+    def delete_record(self, record_id):
+        """Ma'lumotni ID bo'yicha o'chiradi."""
+        self._shard(record_id).delete_record(record_id)
+
+    def update_record(self, record_id, familya, ism, otasi_ismi, jinsi, millati, boyi, tugilgan_sana):
+        """Ma'lumotni yangilaydi."""
+        self._shard(record_id).update_record(record_id, familya, ism, otasi_ismi, jinsi, millati, boyi,
+                                             tugilgan_sana)
+
+    def read_records(self):
+        """Barcha yozuvlarni id tartibida o'qiydi."""
+        return self._sorted_by_id(self._scatter("read_records"))
+
+    def read_record_pages(self, page_size=PAGE_SIZE):
+        """Barcha fayllardagi yozuvlarni id tartibida sahifalab qaytaradi."""
+        merged = heapq.merge(*(shard.iter_records(page_size) for shard in self.shards), key=itemgetter(0))
+        return iter_chunks(merged, page_size)
+
+    def get_all_ids(self):
+        """Barcha IDlar (o'sish tartibida)."""
+        return list(heapq.merge(*(sorted(ids) for ids in self._scatter("get_all_ids"))))
+
+    def count_records(self):
+        """Yozuvlar soni (har bir fayldagi hisoblagichlar yig'indisi)."""
+        return sum(self._scatter("count_records"))
+
+    def _search_text(self, column, text):
+        """Matnli maydon bo'yicha qidiruv (barcha fayllarda)."""
+        return self._sorted_by_id(self._scatter("_search_text", column, text))
+
+    def search(self, query):
+        """So'rovni har bir faylda bajarib, natijalarni so'rov tartibida birlashtiradi."""
+        merged = heapq.merge(*self._scatter("search", query), key=query.sort_key())
+        if query.row_limit is not None:
+            merged = islice(merged, query.row_limit)
+        return list(merged)
+
+    def rebuild_search_index(self):
+        """Barcha fayllarda qidiruv indeksini qayta quradi."""
+        self.search_enabled = all(self._scatter("rebuild_search_index"))
+        return self.search_enabled
+
+    def search_by_jinsi(self, jinsi):
+        """Jinsi bo'yicha qidirish."""
+        return self._sorted_by_id(self._scatter("search_by_jinsi", jinsi))
+
+    def search_by_boyi(self, boyi_min, boyi_max):
+        """Bo'yi oralig'ida qidirish."""
+        return self._sorted_by_id(self._scatter("search_by_boyi", boyi_min, boyi_max))
+
+    def search_by_tugilgan_sana(self, tugilgan_sana):
+        """Tug'ilgan sana bo'yicha qidirish."""
+        return self._sorted_by_id(self._scatter("search_by_tugilgan_sana", tugilgan_sana))
+
+    def close_connection(self):
+        """Barcha ulanishlarni yopadi."""
+        self.pool.shutdown()
+        for shard in self.shards:
+            shard.close_connection()
+        self.ids.close()
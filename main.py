@@ -1,10 +1,210 @@
+import importlib.util
 import os
+import sqlite3
+import time
+from functools import lru_cache
+from itertools import islice
+
+import query_stats
 
 current_dir = os.getcwd()
 final_dir = os.path.join(current_dir, 'all_databas')
 
+# Ommaviy yozishda bitta tranzaksiyaga tushadigan qatorlar soni
+BATCH_SIZE = 10000
+# Sahifalab o'qishda bitta sahifadagi qatorlar soni
+PAGE_SIZE = 50
+
+# Har bir jadval qaysi baza faylida saqlanishi
+TABLE_DATABASES = {
+    "inson": "inson_db.db",
+    "ticher": "ticher_db.db",
+    "student": "student_db.db",
+    "roles": "university.db",
+    "users": "university.db",
+    "students": "university.db",
+}
+
 def db_file_path(path:str):
     if not os.path.exists(final_dir):
        os.makedirs(final_dir)
     db_path = os.path.join(final_dir, path)
-    return db_path
\ No newline at end of file
+    return db_path
+
+def load_module(file_name, name=None):
+    """Loyiha papkasidagi faylni modul sifatida yuklaydi.
+
+    `K.KID_AU_23_db.py` kabi nomida nuqta bo'lgan fayllarni oddiy `import`
+    bilan yuklab bo'lmaydi.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name)
+    spec = importlib.util.spec_from_file_location(name or file_name[:-3].replace(".", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# SQLite sozlamalari to'plamlari. Har bir o'rnatish muhiti uchun DB_PROFILE
+# muhit o'zgaruvchisi orqali tanlanadi.
+PRAGMA_PROFILES = {
+    # Ishonchli yozish: har bir tranzaksiya diskka to'liq tushiriladi
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "temp_store": "DEFAULT",
+    },
+    # Ko'p o'qish: mmap va katta kesh, WAL da NORMAL yetarli
+    "read-heavy": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+    },
+    # Ommaviy yuklash: tezlik uchun fsync o'chiriladi (elektr uzilsa oxirgi
+    # tranzaksiyalar yo'qolishi mumkin)
+    "bulk-load": {
+        "page_size": 8192,
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -256 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+DEFAULT_PROFILE = os.environ.get("DB_PROFILE", "durable")
+
+
+def apply_pragmas(conn, profile=None):
+    """Ulanishga tanlangan sozlamalar to'plamini qo'llaydi.
+
+    Oddiy `sqlite3` ulanishi bilan ham, SQLAlchemy bergan DBAPI ulanishi
+    bilan ham ishlaydi.
+    """
+    profile = profile or DEFAULT_PROFILE
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(f"Noma'lum sozlamalar to'plami: {profile}")
+    cursor = conn.cursor()
+    for name, value in PRAGMA_PROFILES[profile].items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+    cursor.close()
+
+
+def connect(db_name, profile=None, **kwargs):
+    """Sozlamalar to'plami qo'llangan SQLite ulanishini ochadi."""
+    if query_stats.stats.enabled:
+        kwargs.setdefault("factory", query_stats.InstrumentedConnection)
+    conn = sqlite3.connect(db_name, **kwargs)
+    apply_pragmas(conn, profile)
+    return conn
+
+def iter_chunks(iterable, size=BATCH_SIZE):
+    """Iterable ni `size` uzunlikdagi ro'yxatlarga bo'lib beradi."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def bulk_insert(conn, query, rows, chunk_size=BATCH_SIZE):
+    """Qatorlarni bo'laklab `executemany` bilan yozadi.
+
+    Har bir bo'lak alohida tranzaksiyada yoziladi, xato bo'lsa faqat joriy
+    bo'lak bekor qilinadi. (yozilgan qatorlar soni, qator/soniya) qaytaradi.
+    """
+    total = 0
+    started = time.perf_counter()
+    for chunk in iter_chunks(rows, chunk_size):
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(query, chunk)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        total += len(chunk)
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed > 0 else 0.0
+    return total, rate
+
+
+@lru_cache(maxsize=256)
+def update_statement(table, columns, extra=""):
+    """`columns` ustunlarini id bo'yicha yangilovchi UPDATE so'rovi (keshlanadi)."""
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    if extra:
+        assignments += f", {extra}"
+    return f"UPDATE {table} SET {assignments} WHERE id = ?"
+
+
+def bulk_update(conn, table, allowed, updates, extra=""):
+    """(id, {ustun: qiymat}) juftlarini bitta tranzaksiyada yangilaydi.
+
+    Yangilanishlar o'zgargan ustunlar to'plami bo'yicha guruhlanadi va har
+    bir guruh bitta `executemany` bilan bajariladi. Ustunlar `allowed`
+    ro'yxatidan bo'lmasa, hech narsa yozilmasdan `ValueError` ko'tariladi.
+    Yangilangan qatorlar sonini qaytaradi.
+    """
+    groups = {}
+    for id, changes in updates:
+        if not changes:
+            continue
+        unknown = set(changes) - set(allowed)
+        if unknown:
+            raise ValueError(f"Noto'g'ri ustun nomi: {', '.join(sorted(unknown))}")
+        columns = tuple(sorted(changes))
+        groups.setdefault(columns, []).append(tuple(changes[column] for column in columns) + (id,))
+    total = 0
+    try:
+        conn.execute("BEGIN")
+        for columns, rows in groups.items():
+            total += conn.executemany(update_statement(table, columns, extra), rows).rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return total
+
+
+def iter_pages(conn, table, page_size=PAGE_SIZE, key="id"):
+    """Jadvalni kalit (id) kursori bo'yicha sahifalab o'qiydi.
+
+    Har safar faqat bitta sahifa xotirada bo'ladi; `OFFSET` ishlatilmagani
+    uchun har bir sahifa indeks orqali topiladi.
+    """
+    last = None
+    while True:
+        if last is None:
+            cursor = conn.execute(
+                f"SELECT {key}, * FROM {table} ORDER BY {key} LIMIT ?", (page_size,))
+        else:
+            cursor = conn.execute(
+                f"SELECT {key}, * FROM {table} WHERE {key} > ? ORDER BY {key} LIMIT ?",
+                (last, page_size))
+        rows = cursor.fetchall()
+        if not rows:
+            return
+        last = rows[-1][0]
+        yield [row[1:] for row in rows]
+        if len(rows) < page_size:
+            return
+
+
+def print_rows(rows):
+    for row in rows:
+        print(row)
+
+
+def page_through(pages, show=print_rows):
+    """Sahifalarni birma-bir ko'rsatadi, foydalanuvchi to'xtatguncha davom etadi.
+
+    Ko'rsatilgan qatorlar sonini qaytaradi.
+    """
+    shown = 0
+    for number, page in enumerate(pages, start=1):
+        show(page)
+        shown += len(page)
+        answer = input(f"--- {number}-sahifa. Davom etish uchun Enter, chiqish uchun 'q': ")
+        if answer.strip().lower() == "q":
+            break
+    return shown
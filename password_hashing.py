@@ -0,0 +1,39 @@
+"""bcrypt parol xeshlash va ko'p yadroli ommaviy xeshlash.
+
+bcrypt ataylab sekin algoritm, shuning uchun minglab hisoblarni yaratishda
+xeshlash jarayonlar hovuziga (har bir yadroga bittadan) taqsimlanadi.
+Modul SQLAlchemy modellariga bog'liq emas, shuning uchun ishchi
+jarayonlarga faqat xeshlash funksiyasi uzatiladi.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import bcrypt
+
+# bcrypt "cost" parametri: har bir birlik xeshlash vaqtini ikki barobar oshiradi
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", 12))
+
+
+def hash_password(password, rounds=None):
+    """Parolni xeshlaydi."""
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode('utf-8'), salt)
+
+
+def hash_many(passwords, workers=None, rounds=None, executor=None):
+    """Parollar ro'yxatini jarayonlar hovuzida parallel xeshlaydi.
+
+    Natijalar kirish tartibida qaytariladi. `executor` berilsa, o'sha hovuz
+    qayta ishlatiladi (har safar jarayonlarni ishga tushirmaslik uchun).
+    """
+    passwords = list(passwords)
+    hasher = partial(hash_password, rounds=rounds)
+    if workers == 1 and executor is None:
+        return [hasher(password) for password in passwords]
+    # Har bir ishchiga bir necha bo'lakdan tushadi, IPC xarajati kamayadi
+    chunksize = max(1, len(passwords) // ((workers or os.cpu_count() or 1) * 4))
+    if executor is not None:
+        return list(executor.map(hasher, passwords, chunksize=chunksize))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(hasher, passwords, chunksize=chunksize))
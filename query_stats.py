@@ -0,0 +1,222 @@
+"""SQL so'rovlari uchun o'lchov qatlami: vaqt gistogrammasi va sekin so'rovlar.
+
+Yoqilganda (`DB_TRACE=1` yoki `query_stats.enable()`) har bir so'rov
+normallashtirilgan ko'rinishi (qiymatlar `?` bilan almashtirilgan) bo'yicha
+guruhlanib, bajarilish vaqti gistogrammaga yoziladi. Chegaradan
+(`DB_SLOW_MS`) sekin so'rovlar `EXPLAIN QUERY PLAN` natijasi bilan birga
+jurnalga yoziladi. `DB_TRACE=all` da `set_trace_callback` orqali trigger
+ichidagi so'rovlar ham sanaladi.
+
+Oddiy `sqlite3` ulanishlari `main.connect` orqali ochilganda, SQLAlchemy
+engine'lari esa `instrument_engine` bilan ulanadi. O'chirilgan holatda
+ulanishlar oddiy `sqlite3.Connection` bo'lib qoladi, ya'ni qo'shimcha xarajat
+yo'q. Yoqish faqat keyin ochilgan ulanishlarga ta'sir qiladi.
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger("query_stats")
+
+# Gistogramma oraliqlarining yuqori chegaralari (millisekund)
+BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, float("inf"))
+PLANNED_STATEMENTS = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT", "REPLACE")
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize(sql):
+    """So'rovdagi qiymatlarni `?` ga almashtirib, bo'shliqlarni siqadi."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?, ...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class StatementStats:
+    """Bitta normallashtirilgan so'rov bo'yicha hisoblagichlar."""
+
+    __slots__ = ("count", "total_ms", "max_ms", "buckets", "traced")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * len(BUCKETS_MS)
+        self.traced = 0
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "traced": self.traced,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "histogram": {f"<={bound}ms": n for bound, n in zip(BUCKETS_MS, self.buckets) if n},
+        }
+
+
+class QueryStats:
+    """So'rovlar statistikasi to'plovchisi."""
+
+    def __init__(self, slow_ms=100.0, slow_log_size=100):
+        self.enabled = False
+        # Trigger ichidagilar bilan har bir so'rovni sanash (qimmatroq)
+        self.trace_all = False
+        self.slow_ms = slow_ms
+        self.slow_log = deque(maxlen=slow_log_size)
+        self._statements = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, sql):
+        key = normalize(sql)
+        entry = self._statements.get(key)
+        if entry is None:
+            entry = self._statements.setdefault(key, StatementStats())
+        return key, entry
+
+    def record(self, sql, elapsed_ms, explain=None):
+        """Bajarilgan so'rov vaqtini yozadi; sekin bo'lsa rejasini oladi."""
+        with self._lock:
+            key, entry = self._entry(sql)
+            entry.count += 1
+            entry.total_ms += elapsed_ms
+            entry.max_ms = max(entry.max_ms, elapsed_ms)
+            for i, bound in enumerate(BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    entry.buckets[i] += 1
+                    break
+        if elapsed_ms >= self.slow_ms:
+            plan = None
+            if explain is not None and sql.lstrip().upper().startswith(PLANNED_STATEMENTS):
+                try:
+                    plan = [row[-1] for row in explain("EXPLAIN QUERY PLAN " + sql)]
+                except Exception:
+                    plan = None
+            self.slow_log.append({"sql": key, "ms": round(elapsed_ms, 3), "plan": plan, "at": time.time()})
+            logger.warning("Sekin so'rov (%.1f ms): %s | reja: %s", elapsed_ms, key, plan)
+
+    def on_trace(self, sql):
+        """`set_trace_callback` uchun: trigger ichidagilar bilan birga har bir so'rovni sanaydi."""
+        with self._lock:
+            self._entry(sql)[1].traced += 1
+
+    def snapshot(self):
+        """{normallashtirilgan so'rov: hisoblagichlar} lug'ati."""
+        with self._lock:
+            return {sql: entry.as_dict() for sql, entry in self._statements.items()}
+
+    def top(self, n=10, by="total_ms"):
+        """Eng ko'p vaqt olgan (yoki eng ko'p bajarilgan) so'rovlar."""
+        items = self.snapshot().items()
+        return sorted(items, key=lambda item: item[1][by] or 0, reverse=True)[:n]
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self.slow_log.clear()
+
+
+stats = QueryStats(slow_ms=float(os.environ.get("DB_SLOW_MS", 100)))
+stats.enabled = os.environ.get("DB_TRACE") in ("1", "all")
+stats.trace_all = os.environ.get("DB_TRACE") == "all"
+
+
+def enable(slow_ms=None, trace_all=False):
+    """O'lchovni yoqadi (bundan keyin ochilgan ulanishlar uchun).
+
+    `trace_all=True` bo'lsa `set_trace_callback` orqali triggerlar ichida
+    bajarilgan so'rovlar ham sanaladi; bu har bir so'rovga qo'shimcha
+    xarajat qo'shadi.
+    """
+    if slow_ms is not None:
+        stats.slow_ms = slow_ms
+    stats.enabled = True
+    stats.trace_all = trace_all
+
+
+def disable():
+    stats.enabled = False
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """execute/executemany vaqtini o'lchaydigan kursor."""
+
+    def _explain(self, params):
+        def run(sql):
+            return self.connection.cursor(sqlite3.Cursor).execute(sql, params).fetchall()
+        return run
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            if stats.enabled:
+                stats.record(sql, (time.perf_counter() - started) * 1000, self._explain(parameters))
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            if stats.enabled:
+                stats.record(sql, (time.perf_counter() - started) * 1000)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Kursorlari o'lchov qiladigan ulanish (`sqlite3.connect(factory=...)`)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if stats.trace_all:
+            self.set_trace_callback(stats.on_trace)
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def instrument_engine(engine):
+    """SQLAlchemy engine'iga o'lchov hodisalarini ulaydi (yoqilgan bo'lsa)."""
+    if not stats.enabled:
+        return engine
+    from sqlalchemy import event
+
+    if stats.trace_all:
+        @event.listens_for(engine, "connect")
+        def _trace(dbapi_connection, connection_record):
+            dbapi_connection.set_trace_callback(stats.on_trace)
+
+    # Boshlanish vaqti har bir bajarilish kontekstida saqlanadi: xato bilan
+    # tugagan so'rov (after_cursor_execute chaqirilmaydi) hech narsa qoldirmaydi
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        explain = None
+        if not executemany:
+            def explain(sql):
+                return cursor.connection.cursor().execute(sql, parameters).fetchall()
+        stats.record(statement, elapsed_ms, explain)
+
+    return engine
@@ -0,0 +1,103 @@
+"""Kam o'zgaradigan ma'lumotnoma jadvallari (guruh, tashkilot, rol) uchun kesh.
+
+Obyektlarning birlamchi kaliti tabiiy kalit (masalan nomi) bo'yicha LRU
+keshda saqlanadi. Yozuvlar TTL o'tganda eskiradi, sessiyada shu modelga
+tegishli INSERT/UPDATE/DELETE bo'lganda esa darhol o'chiriladi. Tranzaksiya
+bekor qilinsa (rollback), unda o'zgargan modellar yozuvlari yana o'chiriladi:
+flush dan keyin keshlangan, lekin saqlanmagan id lar qolib ketmaydi.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, select
+
+# session.info kaliti: joriy tranzaksiyada o'zgargan modellar
+_CHANGED_MODELS = "reference_cache_changed"
+
+
+class ReferenceCache:
+    """Tabiiy kalit -> birlamchi kalit LRU keshi (TTL bilan)."""
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._keys = {}
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def track(self, model, key_attribute):
+        """Modelni `key_attribute` ustuni bo'yicha keshlashni yoqadi."""
+        self._keys[model] = key_attribute
+
+    def listen(self, session_factory):
+        """Sessiya hodisalariga ulanib, o'zgarishlarda keshni tozalaydi."""
+        event.listen(session_factory, "after_flush", self._after_flush)
+        event.listen(session_factory, "do_orm_execute", self._on_execute)
+        event.listen(session_factory, "after_soft_rollback", self._after_rollback)
+        event.listen(session_factory, "after_commit", self._after_commit)
+
+    def get_id(self, session, model, key):
+        """Tabiiy kalit bo'yicha birlamchi kalitni qaytaradi (topilmasa None).
+
+        Keshda bo'lsa bazaga umuman murojaat qilinmaydi.
+        """
+        cache_key = (model, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(cache_key)
+            if entry is not None and entry[1] > now:
+                self._data.move_to_end(cache_key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        column = getattr(model, self._keys[model])
+        primary_key = session.execute(
+            select(model.id).where(column == key)).scalar_one_or_none()
+        if primary_key is not None:
+            with self._lock:
+                self._data[cache_key] = (primary_key, now + self.ttl)
+                self._data.move_to_end(cache_key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return primary_key
+
+    def get(self, session, model, key):
+        """Tabiiy kalit bo'yicha obyektni qaytaradi.
+
+        Obyekt sessiyaning identity map'ida bo'lsa so'rov yuborilmaydi.
+        """
+        primary_key = self.get_id(session, model, key)
+        return None if primary_key is None else session.get(model, primary_key)
+
+    def invalidate(self, model=None):
+        """Model (yoki butun kesh) yozuvlarini o'chiradi."""
+        with self._lock:
+            if model is None:
+                self._data.clear()
+                return
+            for cache_key in [k for k in self._data if k[0] is model]:
+                del self._data[cache_key]
+
+    def _after_flush(self, session, flush_context):
+        changed = {type(obj) for obj in (*session.new, *session.dirty, *session.deleted)}
+        for model in changed & self._keys.keys():
+            self.invalidate(model)
+            session.info.setdefault(_CHANGED_MODELS, set()).add(model)
+
+    def _on_execute(self, orm_execute_state):
+        if orm_execute_state.is_update or orm_execute_state.is_delete:
+            mapper = orm_execute_state.bind_mapper
+            model = mapper.class_ if mapper is not None else None
+            if model is None or model in self._keys:
+                self.invalidate(model)
+                orm_execute_state.session.info.setdefault(_CHANGED_MODELS, set()).add(model)
+
+    def _after_rollback(self, session, previous_transaction):
+        for model in session.info.pop(_CHANGED_MODELS, ()):
+            self.invalidate(model)
+
+    def _after_commit(self, session):
+        session.info.pop(_CHANGED_MODELS, None)
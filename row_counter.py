@@ -0,0 +1,100 @@
+"""Jadvallar qatorlari sonini triggerlar orqali yuritiladigan hisoblagich.
+
+`SELECT COUNT(*)` butun b-daraxtni aylanib chiqadi. Bu yerda har bir jadval
+uchun son `row_counts` jadvalida saqlanadi va INSERT/DELETE triggerlari
+uni yangilab boradi, shuning uchun sonni o'qish doimiy vaqt oladi.
+"""
+import sqlite3
+import sys
+
+COUNTS_TABLE = "row_counts"
+
+
+def install_counter(conn, table):
+    """Jadval uchun hisoblagich va triggerlarni o'rnatadi.
+
+    Hisoblagich birinchi marta o'rnatilganda joriy son `COUNT(*)` bilan
+    olinadi; triggerlar bilan bir tranzaksiyada bo'lgani uchun oradagi
+    yozuvlar yo'qolmaydi.
+    """
+    conn.execute("BEGIN")
+    try:
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {COUNTS_TABLE} (
+                table_name TEXT PRIMARY KEY,
+                row_count INTEGER NOT NULL
+            )
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_count_ai AFTER INSERT ON {table} BEGIN
+                UPDATE {COUNTS_TABLE} SET row_count = row_count + 1 WHERE table_name = '{table}';
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table}_count_ad AFTER DELETE ON {table} BEGIN
+                UPDATE {COUNTS_TABLE} SET row_count = row_count - 1 WHERE table_name = '{table}';
+            END
+        ''')
+        conn.execute(
+            f"INSERT OR IGNORE INTO {COUNTS_TABLE} (table_name, row_count) "
+            f"SELECT ?, COUNT(*) FROM {table}", (table,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def get_count(conn, table):
+    """Jadvaldagi qatorlar soni (hisoblagich bo'lmasa `COUNT(*)`)."""
+    try:
+        row = conn.execute(
+            f"SELECT row_count FROM {COUNTS_TABLE} WHERE table_name = ?", (table,)).fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    if row is None:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    return row[0]
+
+
+def reconcile(conn, table=None):
+    """Hisoblagichni haqiqiy `COUNT(*)` bilan solishtirib tuzatadi.
+
+    {jadval: (eski_son, haqiqiy_son)} ko'rinishida faqat farq qilganlarini
+    qaytaradi.
+    """
+    if table is None:
+        tables = [row[0] for row in conn.execute(f"SELECT table_name FROM {COUNTS_TABLE}")]
+    else:
+        tables = [table]
+    drift = {}
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for name in tables:
+            actual = conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+            row = conn.execute(
+                f"SELECT row_count FROM {COUNTS_TABLE} WHERE table_name = ?", (name,)).fetchone()
+            stored = row[0] if row else None
+            if stored != actual:
+                drift[name] = (stored, actual)
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {COUNTS_TABLE} (table_name, row_count) VALUES (?, ?)",
+                    (name, actual))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return drift
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Foydalanish: python row_counter.py BAZA_FAYLI [JADVAL]")
+        sys.exit(1)
+    connection = sqlite3.connect(sys.argv[1])
+    changes = reconcile(connection, sys.argv[2] if len(sys.argv) > 2 else None)
+    if changes:
+        for name, (stored, actual) in changes.items():
+            print(f"{name}: {stored} -> {actual}")
+    else:
+        print("Hisoblagichlar to'g'ri.")
+    connection.close()
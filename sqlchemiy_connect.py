@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
+from concurrent.futures import ProcessPoolExecutor
+
 import bcrypt
 from sqlalchemy import (
-    create_engine, Column, Integer, String, ForeignKey, Table
+    create_engine, event, select, Column, Integer, String, ForeignKey, Table
 )
 from sqlalchemy.orm import relationship, sessionmaker, declarative_base
+import query_stats
+from main import apply_pragmas, iter_chunks
+import password_hashing
+from reference_cache import ReferenceCache
 
 # Bazaviy modelni yaratish
 Base = declarative_base()
@@ -17,10 +23,8 @@ user_roles_table = Table(
 
 # Parolni xeshlash funksiyasi
 def hash_password(password):
-    """Parolni xeshlaydi."""
-    salt = bcrypt.gensalt()  # Tasodifiy tuz (salt) generatsiya qiladi
-    hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed_password
+    """Parolni xeshlaydi (cost - password_hashing.BCRYPT_ROUNDS)."""
+    return password_hashing.hash_password(password)
 
 # Parolni tekshirish funksiyasi
 def check_password(hashed_password, plain_password):
@@ -62,6 +66,13 @@ class Role(Base):
 # SQLite ma'lumotlar bazasini ulash
 engine = create_engine('sqlite:///app.db')
 
+# Har bir yangi ulanishga umumiy SQLite sozlamalarini qo'llash
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    apply_pragmas(dbapi_connection)
+
+query_stats.instrument_engine(engine)
+
 # Jadvalni yaratish
 Base.metadata.create_all(engine)
 
@@ -69,6 +80,61 @@ Base.metadata.create_all(engine)
 Session = sessionmaker(bind=engine)
 session = Session()
 
+# Rollarni nomi bo'yicha qidirish uchun kesh
+reference_cache = ReferenceCache()
+reference_cache.track(Role, "name")
+reference_cache.listen(Session)
+
+def get_role(name):
+    """Rolni nomi bo'yicha qaytaradi (topilmasa None)."""
+    return reference_cache.get(session, Role, name)
+
+# Ko'p foydalanuvchini bir yo'la yaratish
+def bulk_create_users(accounts, workers=None, batch_size=1000, rounds=None, db_session=None):
+    """Foydalanuvchilarni ommaviy yaratadi.
+
+    `accounts` - (username, email, parol, [rol nomlari]) qatorlari. Parollar
+    barcha yadrolarda parallel xeshlanadi, foydalanuvchilar va rol
+    bog'lanishlari esa har `batch_size` ta uchun bitta tranzaksiyada yoziladi.
+    Yaratilgan foydalanuvchilar sonini qaytaradi.
+    """
+    db_session = db_session or session
+    role_ids = {}
+    total = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in iter_chunks(accounts, batch_size):
+            hashes = password_hashing.hash_many(
+                [account[2] for account in batch], workers=workers, rounds=rounds, executor=pool)
+
+            wanted = {name for account in batch for name in (account[3] if len(account) > 3 else ())}
+            missing = wanted - role_ids.keys()
+            if missing:
+                known = db_session.execute(
+                    select(Role.name, Role.id).where(Role.name.in_(missing))).all()
+                role_ids.update(known)
+                for name in missing - role_ids.keys():
+                    role = Role(name=name)
+                    db_session.add(role)
+                    db_session.flush()
+                    role_ids[name] = role.id
+
+            db_session.execute(User.__table__.insert(), [
+                {"username": account[0], "email": account[1], "password": hashed.decode('utf-8')}
+                for account, hashed in zip(batch, hashes)
+            ])
+            user_ids = dict(db_session.execute(
+                select(User.username, User.id).where(User.username.in_([a[0] for a in batch]))).all())
+            links = [
+                {"user_id": user_ids[account[0]], "role_id": role_ids[name]}
+                for account in batch for name in (account[3] if len(account) > 3 else ())
+            ]
+            if links:
+                db_session.execute(user_roles_table.insert(), links)
+            db_session.commit()
+            total += len(batch)
+    return total
+
+
 # Misol uchun foydalanuvchilar va rollarni qoshish
 if __name__ == '__main__':
     # Rollarni yaratish
@@ -1,7 +1,12 @@
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Date
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy import create_engine, event, Column, Integer, String, ForeignKey, Date
+from sqlalchemy import select, insert, func, true
+from sqlalchemy.orm import sessionmaker, relationship, selectinload, joinedload
 from sqlalchemy.ext.declarative import declarative_base
-from bcrypt import hashpw, gensalt, checkpw
+from bcrypt import checkpw
+from password_hashing import hash_password
+from reference_cache import ReferenceCache
+import query_stats
+from main import apply_pragmas
 
 # SQLAlchemy base class
 Base = declarative_base()
@@ -10,6 +15,13 @@ Base = declarative_base()
 DATABASE_URL = "sqlite:///university.db"
 engine = create_engine(DATABASE_URL, echo=False)
 
+# Har bir yangi ulanishga umumiy SQLite sozlamalarini qo'llash
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    apply_pragmas(dbapi_connection)
+
+query_stats.instrument_engine(engine)
+
 # Session yaratish
 Session = sessionmaker(bind=engine)
 session = Session()
@@ -24,7 +36,7 @@ class User(Base):
     password_hash = Column(String(128), nullable=False)
 
     def set_password(self, password):
-        self.password_hash = hashpw(password.encode('utf-8'), gensalt()).decode('utf-8')
+        self.password_hash = hash_password(password).decode('utf-8')
 
     def check_password(self, password):
         return checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
@@ -77,6 +89,15 @@ Student.organizations = relationship("StudentOrganization", back_populates="stud
 # Jadvalni yaratish
 Base.metadata.create_all(engine)
 
+# Guruh va tashkilotlarni nomi bo'yicha qidirish uchun kesh
+reference_cache = ReferenceCache()
+reference_cache.track(Group, "name")
+reference_cache.track(Organization, "name")
+reference_cache.listen(Session)
+
+# Bog'liq obyektlarni oldindan yuklash strategiyalari
+LOAD_STRATEGIES = {"selectin": selectinload, "joined": joinedload}
+
 # CRUD operatsiyalarini amalga oshirish
 def create_user(username, email, password):
     new_user = User(username=username, email=email)
@@ -86,11 +107,11 @@ def create_user(username, email, password):
     print(f"User {username} created!")
 
 def create_student(first_name, last_name, email, major, group_name):
-    group = session.query(Group).filter_by(name=group_name).first()
-    if not group:
+    group_id = reference_cache.get_id(session, Group, group_name)
+    if group_id is None:
         print(f"Group {group_name} not found!")
         return
-    new_student = Student(first_name=first_name, last_name=last_name, email=email, major=major, group=group)
+    new_student = Student(first_name=first_name, last_name=last_name, email=email, major=major, group_id=group_id)
     session.add(new_student)
     session.commit()
     print(f"Student {first_name} {last_name} created!")
@@ -109,15 +130,43 @@ def create_organization(name, contact_email):
 
 def assign_student_to_organization(student_email, org_name):
     student = session.query(Student).filter_by(email=student_email).first()
-    organization = session.query(Organization).filter_by(name=org_name).first()
-    if student and organization:
-        student_org = StudentOrganization(student_id=student.id, organization_id=organization.id)
+    organization_id = reference_cache.get_id(session, Organization, org_name)
+    if student and organization_id is not None:
+        student_org = StudentOrganization(student_id=student.id, organization_id=organization_id)
         session.add(student_org)
         session.commit()
-        print(f"Student {student.first_name} {student.last_name} assigned to {organization.name}")
+        print(f"Student {student.first_name} {student.last_name} assigned to {org_name}")
     else:
         print(f"Student or Organization not found.")
 
+def bulk_enroll(student_emails, org_names):
+    """Talabalar ro'yxatini tashkilotlar ro'yxatiga bitta so'rovda biriktiradi.
+
+    Mavjud bog'lanishlar `INSERT OR IGNORE` orqali o'tkazib yuboriladi, barcha
+    yozuvlar bitta commit bilan saqlanadi.
+    """
+    emails = list(set(student_emails))
+    names = list(set(org_names))
+    student_count, org_count = session.execute(select(
+        select(func.count()).where(Student.email.in_(emails)).scalar_subquery(),
+        select(func.count()).where(Organization.name.in_(names)).scalar_subquery(),
+    )).one()
+    pairs = select(Student.id, Organization.id).join_from(Student, Organization, true()).where(
+        Student.email.in_(emails), Organization.name.in_(names))
+    result = session.execute(
+        insert(StudentOrganization).prefix_with("OR IGNORE")
+        .from_select(["student_id", "organization_id"], pairs))
+    session.commit()
+    inserted = result.rowcount
+    report = {
+        "inserted": inserted,
+        "skipped": student_count * org_count - inserted,
+        "students_not_found": len(emails) - student_count,
+        "organizations_not_found": len(names) - org_count,
+    }
+    print(f"{inserted} enrollments added, {report['skipped']} already existed.")
+    return report
+
 def delete_user(username):
     user = session.query(User).filter_by(username=username).first()
     if user:
@@ -136,8 +185,48 @@ def update_student_major(email, new_major):
     else:
         print(f"Student with email {email} not found.")
 
+# O'qish so'rovlari: group -> students -> organizations grafini oldindan yuklash
+def _eager_path(strategy, *attributes):
+    """Har bir bosqich uchun strategiya tanlab yuklash zanjirini quradi.
+
+    `strategy` - "selectin", "joined" yoki har bir bosqich uchun alohida
+    nomlar ketma-ketligi (masalan ("joined", "selectin", "selectin")).
+    """
+    if isinstance(strategy, str):
+        strategy = [strategy] * len(attributes)
+    option = None
+    for name, attribute in zip(strategy, attributes):
+        loader = LOAD_STRATEGIES[name]
+        option = loader(attribute) if option is None else getattr(option, loader.__name__)(attribute)
+    return option
+
+def load_groups(group_names=None, strategy="selectin", with_organizations=True):
+    """Guruhlarni talabalari (va ularning tashkilotlari) bilan birga yuklaydi.
+
+    Guruhlar soni qancha bo'lishidan qat'i nazar so'rovlar soni o'zgarmaydi:
+    "selectin" da har bosqichga bitta so'rov, "joined" da esa bitta JOIN.
+    """
+    path = [Group.students]
+    if with_organizations:
+        path += [Student.organizations, StudentOrganization.organization]
+    query = select(Group).options(_eager_path(strategy, *path)).order_by(Group.id)
+    if group_names is not None:
+        query = query.where(Group.name.in_(list(group_names)))
+    return session.execute(query).unique().scalars().all()
+
+def load_students(emails=None, strategy="selectin"):
+    """Talabalarni guruhi va tashkilotlari bilan birga yuklaydi."""
+    query = select(Student).options(
+        _eager_path(strategy, Student.group),
+        _eager_path(strategy, Student.organizations, StudentOrganization.organization),
+    ).order_by(Student.id)
+    if emails is not None:
+        query = query.where(Student.email.in_(list(emails)))
+    return session.execute(query).unique().scalars().all()
+
 def view_students_in_group(group_name):
-    group = session.query(Group).filter_by(name=group_name).first()
+    groups = load_groups([group_name], with_organizations=False)
+    group = groups[0] if groups else None
     if group:
         students = group.students
         if students:
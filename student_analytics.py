@@ -0,0 +1,170 @@
+"""Talabalar baholari bo'yicha oldindan yig'ilgan statistika.
+
+`student_stats` jadvalida har bir (oliy o'quv yurti, fakultet, kurs) uchun
+talabalar soni, baholar yig'indisi, kvadratlar yig'indisi, minimum va
+maksimum saqlanadi. INSERT/UPDATE/DELETE triggerlari uni bosqichma-bosqich
+yangilab boradi, shuning uchun hisobot so'rovlari `student` jadvalini
+to'liq o'qimaydi. O'rtacha va standart og'ish yig'indilardan hisoblanadi.
+"""
+import math
+
+STATS_TABLE = "student_stats"
+GROUP_COLUMNS = ("oliy_oquv_yurti", "fakultet", "kurs")
+
+# Guruh kaliti: NULL qiymatlar birlamchi kalitda teng hisoblanmagani uchun
+_KEY = {
+    "oliy_oquv_yurti": "IFNULL({}, '')",
+    "fakultet": "IFNULL({}, '')",
+    "kurs": "IFNULL({}, 0)",
+}
+
+
+def _key_part(column, row=None):
+    return _KEY[column].format(f"{row}.{column}" if row else column)
+
+
+def _key(row=None):
+    return ", ".join(_key_part(column, row) for column in GROUP_COLUMNS)
+
+
+def _key_match(row):
+    return " AND ".join(f"{column} = {_key_part(column, row)}" for column in GROUP_COLUMNS)
+
+
+def _add(row):
+    """`row` (NEW) qatorini statistikaga qo'shuvchi UPSERT."""
+    return f'''
+        INSERT INTO {STATS_TABLE} (oliy_oquv_yurti, fakultet, kurs, soni, bal_soni,
+                                   bal_yigindisi, bal_kvadratlar, min_bal, max_bal)
+        VALUES ({_key(row)}, 1, {row}.ortacha_bal IS NOT NULL,
+                IFNULL({row}.ortacha_bal, 0), IFNULL({row}.ortacha_bal * {row}.ortacha_bal, 0),
+                {row}.ortacha_bal, {row}.ortacha_bal)
+        ON CONFLICT (oliy_oquv_yurti, fakultet, kurs) DO UPDATE SET
+            soni = soni + 1,
+            bal_soni = bal_soni + excluded.bal_soni,
+            bal_yigindisi = bal_yigindisi + excluded.bal_yigindisi,
+            bal_kvadratlar = bal_kvadratlar + excluded.bal_kvadratlar,
+            min_bal = CASE WHEN min_bal IS NULL OR excluded.min_bal < min_bal
+                           THEN IFNULL(excluded.min_bal, min_bal) ELSE min_bal END,
+            max_bal = CASE WHEN max_bal IS NULL OR excluded.max_bal > max_bal
+                           THEN IFNULL(excluded.max_bal, max_bal) ELSE max_bal END;
+    '''
+
+
+def _remove(row):
+    """`row` (OLD) qatorini statistikadan ayiruvchi so'rovlar.
+
+    Ayirilgan baho minimum yoki maksimumga teng bo'lsa, u guruh uchun
+    indeks orqali qayta hisoblanadi. Guruh kalitdagi ifodalar bilan
+    tanlanadi, shuning uchun NULL va '' bitta guruhga tushadi.
+    """
+    same_group = " AND ".join(f"{_key_part(column)} = {_key_part(column, row)}" for column in GROUP_COLUMNS)
+    return f'''
+        UPDATE {STATS_TABLE} SET
+            soni = soni - 1,
+            bal_soni = bal_soni - ({row}.ortacha_bal IS NOT NULL),
+            bal_yigindisi = bal_yigindisi - IFNULL({row}.ortacha_bal, 0),
+            bal_kvadratlar = bal_kvadratlar - IFNULL({row}.ortacha_bal * {row}.ortacha_bal, 0),
+            min_bal = CASE WHEN {row}.ortacha_bal <= min_bal
+                           THEN (SELECT MIN(ortacha_bal) FROM student WHERE {same_group})
+                           ELSE min_bal END,
+            max_bal = CASE WHEN {row}.ortacha_bal >= max_bal
+                           THEN (SELECT MAX(ortacha_bal) FROM student WHERE {same_group})
+                           ELSE max_bal END
+        WHERE {_key_match(row)};
+        DELETE FROM {STATS_TABLE} WHERE {_key_match(row)} AND soni <= 0;
+    '''
+
+
+def install(conn):
+    """Statistika jadvali, indeks va triggerlarni yaratadi.
+
+    Jadval yangi yaratilgan bo'lsa mavjud talabalar bo'yicha to'ldiriladi.
+    """
+    existed = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (STATS_TABLE,)
+    ).fetchone() is not None
+    conn.executescript(f'''
+        CREATE TABLE IF NOT EXISTS {STATS_TABLE} (
+            oliy_oquv_yurti TEXT NOT NULL,
+            fakultet TEXT NOT NULL,
+            kurs INTEGER NOT NULL,
+            soni INTEGER NOT NULL,
+            bal_soni INTEGER NOT NULL,
+            bal_yigindisi REAL NOT NULL,
+            bal_kvadratlar REAL NOT NULL,
+            min_bal REAL,
+            max_bal REAL,
+            PRIMARY KEY (oliy_oquv_yurti, fakultet, kurs)
+        );
+        CREATE INDEX IF NOT EXISTS idx_student_guruh_kalit_bal
+            ON student ({_key()}, ortacha_bal);
+        CREATE TRIGGER IF NOT EXISTS student_stats_ai AFTER INSERT ON student BEGIN
+            {_add("NEW")}
+        END;
+        CREATE TRIGGER IF NOT EXISTS student_stats_ad AFTER DELETE ON student BEGIN
+            {_remove("OLD")}
+        END;
+        CREATE TRIGGER IF NOT EXISTS student_stats_au
+        AFTER UPDATE OF oliy_oquv_yurti, fakultet, kurs, ortacha_bal ON student BEGIN
+            {_remove("OLD")}
+            {_add("NEW")}
+        END;
+    ''')
+    if not existed:
+        rebuild(conn)
+
+
+def rebuild(conn):
+    """Statistikani `student` jadvalidan qaytadan hisoblaydi."""
+    with conn:
+        conn.execute(f"DELETE FROM {STATS_TABLE}")
+        conn.execute(f'''
+            INSERT INTO {STATS_TABLE} (oliy_oquv_yurti, fakultet, kurs, soni, bal_soni,
+                                       bal_yigindisi, bal_kvadratlar, min_bal, max_bal)
+            SELECT {_key("student")}, COUNT(*), COUNT(ortacha_bal),
+                   IFNULL(SUM(ortacha_bal), 0), IFNULL(SUM(ortacha_bal * ortacha_bal), 0),
+                   MIN(ortacha_bal), MAX(ortacha_bal)
+            FROM student
+            GROUP BY {_key("student")}
+        ''')
+
+
+def summary(conn, group_by=GROUP_COLUMNS, **filters):
+    """Baholar statistikasini `student_stats` dan hisoblaydi.
+
+    `group_by` - natija qaysi maydonlar bo'yicha guruhlanishi (bo'sh bo'lsa
+    umumiy natija), `filters` - masalan fakultet="Matematika", kurs=2.
+    Har bir guruh uchun soni, o'rtacha, standart og'ish, minimum va maksimum
+    qaytariladi.
+    """
+    for column in (*group_by, *filters):
+        if column not in GROUP_COLUMNS:
+            raise ValueError(f"Noma'lum maydon: {column}")
+    select = ", ".join(group_by)
+    query = f'''
+        SELECT {select + "," if select else ""}
+               SUM(soni), SUM(bal_soni), SUM(bal_yigindisi), SUM(bal_kvadratlar),
+               MIN(min_bal), MAX(max_bal)
+        FROM {STATS_TABLE}
+    '''
+    if filters:
+        query += " WHERE " + " AND ".join(f"{column} = ?" for column in filters)
+    if group_by:
+        query += f" GROUP BY {select} ORDER BY {select}"
+    results = []
+    for row in conn.execute(query, tuple(filters.values())):
+        keys, (soni, bal_soni, yigindi, kvadratlar, min_bal, max_bal) = row[:len(group_by)], row[len(group_by):]
+        if not soni:
+            continue
+        mean = yigindi / bal_soni if bal_soni else None
+        stddev = math.sqrt(max(0.0, kvadratlar / bal_soni - mean * mean)) if bal_soni else None
+        results.append({
+            **dict(zip(group_by, keys)),
+            "soni": soni,
+            "ortacha": mean,
+            "standart_ogish": stddev,
+            "min": min_bal,
+            "max": max_bal,
+        })
+    return results
@@ -1,13 +1,32 @@
-from main import db_file_path
+from main import db_file_path, connect, bulk_insert, bulk_update, iter_pages, page_through, BATCH_SIZE, PAGE_SIZE
 from datetime import datetime
-import sqlite3
-from tabulate import tabulate
+import row_counter
+import changelog
+import student_analytics
+from table_render import GridWriter, MAX_COLUMN_WIDTH
+
+# Reyting so'rovlari uchun qoplovchi indekslar
+LEADERBOARD_INDEXES = {
+    "idx_student_fakultet_kurs_bal": "fakultet, kurs, ortacha_bal DESC, id",
+    "idx_student_fakultet_bal": "fakultet, ortacha_bal DESC, id",
+    "idx_student_bal": "ortacha_bal DESC, id",
+}
+
+# Yangilash mumkin bo'lgan ustunlar
+STUDENT_COLUMNS = ("familya", "ismi", "otasining_ismi", "jinsi", "millati", "ogirligi", "tugilgan_sana",
+                   "oliy_oquv_yurti", "fakultet", "kurs", "ortacha_bal")
+
+STUDENT_HEADERS = ["ID", "Familya", "Ismi", "Otasining_ismi", "Jinsi", "Millati", "Og'irligi", "Tug'ilgan_sana",
+                   "Oliy_o'quv_yurti", "Fakultet", "Kurs", "O'rtacha_bal", "Saqlangan vaqt"]
+
 
 class StudentDatabase:
     db_name = db_file_path("student_db.db")
 
-    def __init__(self):
-        self.connection = sqlite3.connect(self.db_name)
+    def __init__(self, db_name=None, profile=None):
+        if db_name:
+            self.db_name = db_name
+        self.connection = connect(self.db_name, profile)
         self.cursor = self.connection.cursor()
         self.create_table()
 
@@ -31,6 +50,12 @@ class StudentDatabase:
         """
         self.cursor.execute(query)
         self.connection.commit()
+        row_counter.install_counter(self.connection, "student")
+        changelog.install(self.connection, "student")
+        student_analytics.install(self.connection)
+        for name, columns in LEADERBOARD_INDEXES.items():
+            self.cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON student ({columns})")
+        self.connection.commit()
 
     def add_student(self, familya, ismi, otasining_ismi, jinsi, millati, ogirligi, tugilgan_sana, oliy_oquv_yurti, fakultet, kurs, ortacha_bal):
         try:
@@ -44,19 +69,66 @@ class StudentDatabase:
         except ValueError:
             print("Xatolik: Tug'ilgan sana noto'g'ri formatda (to'g'ri format: YYYY-MM-DD).")
 
-    def view_students(self):
-        query = "SELECT * FROM student"
-        self.cursor.execute(query)
-        students = self.cursor.fetchall()
-        headers = ["ID", "Familya", "Ismi", "Otasining_ismi", "Jinsi", "Millati", "Og'irligi", "Tug'ilgan_sana", 
-                   "Oliy_o'quv_yurti", "Fakultet", "Kurs", "O'rtacha_bal", "Saqlangan vaqt"]
-        print(tabulate(students, headers=headers, tablefmt="grid"))
+    def add_students(self, students, chunk_size=BATCH_SIZE):
+        """Ko'p talabani bo'laklab, tranzaksiya ichida qo'shadi.
+
+        `students` qatorlari `add_student` argumentlari tartibida bo'ladi.
+        (qo'shilgan talabalar soni, qator/soniya) qaytaradi.
+        """
+        def rows():
+            for student in students:
+                student = list(student)
+                student[6] = datetime.strptime(student[6], "%Y-%m-%d").date()
+                yield student
+
+        query = """
+        INSERT INTO student (familya, ismi, otasining_ismi, jinsi, millati, ogirligi, tugilgan_sana, oliy_oquv_yurti, fakultet, kurs, ortacha_bal)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        return bulk_insert(self.connection, query, rows(), chunk_size)
+
+    def student_pages(self, page_size=PAGE_SIZE):
+        """Talabalarni id bo'yicha sahifalab qaytaruvchi generator."""
+        return iter_pages(self.connection, "student", page_size)
+
+    def column_widths(self):
+        """Ustunlardagi eng uzun qiymat uzunliklari (jadvalni chiqarish uchun)."""
+        columns = [row[1] for row in self.cursor.execute("PRAGMA table_info(student)").fetchall()]
+        lengths = ", ".join(f"MAX(LENGTH({column}))" for column in columns)
+        self.cursor.execute(f"SELECT {lengths} FROM student")
+        maxima = self.cursor.fetchone()
+        return [min(max(len(header), length or 0), MAX_COLUMN_WIDTH)
+                for header, length in zip(STUDENT_HEADERS, maxima)]
+
+    def view_students(self, out=None, page_size=PAGE_SIZE, exact_widths=False):
+        """Talabalarni jadval ko'rinishida bo'laklab chiqaradi.
+
+        `out` berilmasa ekranga sahifama-sahifa, aks holda faylga to'liq yoziladi.
+        Ustun kengliklari birinchi sahifadan, `exact_widths=True` bo'lsa esa
+        butun jadval bo'yicha hisoblanadi. Chiqarilgan qatorlar sonini qaytaradi.
+        """
+        widths = self.column_widths() if exact_widths else None
+        writer = GridWriter(STUDENT_HEADERS, out, widths)
+        pages = self.student_pages(page_size)
+        if out is None:
+            page_through(pages, writer.write_rows)
+        else:
+            for page in pages:
+                writer.write_rows(page)
+        writer.close()
+        return writer.rows_written
 
     def update_student(self, student_id, updates):
-        update_clauses = ", ".join([f"{key} = ?" for key in updates.keys()])
-        query = f"UPDATE student SET {update_clauses}, saqlangan_vaqt = CURRENT_TIMESTAMP WHERE id = ?"
-        self.cursor.execute(query, (*updates.values(), student_id))
-        self.connection.commit()
+        self.update_many([(student_id, updates)])
+
+    def update_many(self, updates):
+        """(talaba_id, {ustun: qiymat}) juftlarini bitta tranzaksiyada yangilaydi.
+
+        Faqat `STUDENT_COLUMNS` dagi ustunlarni o'zgartirish mumkin, aks holda
+        `ValueError`. Yangilangan talabalar sonini qaytaradi.
+        """
+        return bulk_update(self.connection, "student", STUDENT_COLUMNS, updates,
+                           extra="saqlangan_vaqt = CURRENT_TIMESTAMP")
 
     def delete_student(self, student_id):
         query = "DELETE FROM student WHERE id = ?"
@@ -70,9 +142,98 @@ class StudentDatabase:
         print("Barcha talaba ma'lumotlari o'chirildi!")
 
     def count_students(self):
-        query = "SELECT COUNT(*) FROM student"
-        self.cursor.execute(query)
-        return self.cursor.fetchone()[0]
+        return row_counter.get_count(self.connection, "student")
+
+    def grade_stats(self, group_by=student_analytics.GROUP_COLUMNS, **filters):
+        """Baholar statistikasi (soni, o'rtacha, standart og'ish, min, max).
+
+        Masalan: grade_stats(group_by=("kurs",), fakultet="Matematika").
+        """
+        return student_analytics.summary(self.connection, group_by, **filters)
+
+    @staticmethod
+    def _leaderboard_scope(fakultet=None, kurs=None):
+        """Reyting doirasi uchun WHERE sharti va parametrlari."""
+        conditions, params = ["ortacha_bal IS NOT NULL"], []
+        if fakultet is not None:
+            conditions.append("fakultet = ?")
+            params.append(fakultet)
+        if kurs is not None:
+            conditions.append("kurs = ?")
+            params.append(kurs)
+        return " AND ".join(conditions), params
+
+    def _leaderboard_pages(self, where, params, page_size):
+        """Reyting sahifalari (keyset): har bir qator boshida o'rni turadi.
+
+        Keyingi sahifa oldingi sahifaning oxirgi (ortacha_bal, id) kalitidan
+        keyin indeksdan o'qiladi, shuning uchun OFFSET kabi oldingi qatorlar
+        qayta o'tilmaydi. O'rinlar (teng ballilar bir xil o'rinda) o'qilgan
+        qatorlar soni bo'yicha hisoblanadi, alohida sanash so'rovisiz.
+        """
+        query = f"SELECT * FROM student WHERE {where}{{after}} ORDER BY ortacha_bal DESC, id LIMIT ?"
+        after = " AND ortacha_bal <= ? AND NOT (ortacha_bal = ? AND id <= ?)"
+        position, rank, previous, last = 0, 0, None, None
+        while True:
+            if last is None:
+                self.cursor.execute(query.format(after=""), (*params, page_size))
+            else:
+                self.cursor.execute(query.format(after=after), (*params, last[11], last[11], last[0], page_size))
+            rows = self.cursor.fetchall()
+            if not rows:
+                return
+            page = []
+            for row in rows:
+                position += 1
+                if row[11] != previous:
+                    rank, previous = position, row[11]
+                page.append((rank,) + row)
+            yield page
+            last = rows[-1]
+
+    def iter_leaderboard(self, fakultet=None, kurs=None, page_size=PAGE_SIZE):
+        """O'rtacha bal bo'yicha reytingni sahifalab qaytaradi.
+
+        Har bir sahifa qoplovchi indeksning keyingi oralig'idan o'qiladi,
+        jadval saralanmaydi va sahifa narxi uning raqamiga bog'liq emas.
+        """
+        where, params = self._leaderboard_scope(fakultet, kurs)
+        return self._leaderboard_pages(where, params, page_size)
+
+    def top_students(self, fakultet=None, kurs=None, limit=10):
+        """O'rtacha bal bo'yicha eng yaxshi `limit` talaba (o'rni bilan)."""
+        return next(self.iter_leaderboard(fakultet, kurs, limit), [])
+
+    def rank_of(self, student_id, fakultet=None, kurs=None):
+        """Talabaning berilgan doiradagi o'rni (bal bo'yicha) yoki None.
+
+        Talaba doiradan tashqarida (boshqa fakultet/kurs) bo'lsa None.
+        Undan yuqori baldagi talabalar qoplovchi indeks oralig'ida sanaladi:
+        jadval o'qilmaydi va saralanmaydi, lekin SQLite B-daraxti tartib
+        statistikasini saqlamagani uchun narx O(log n + o'rin) - o'rin
+        qancha past bo'lsa, shuncha ko'p indeks yozuvi o'tiladi.
+        """
+        where, params = self._leaderboard_scope(fakultet, kurs)
+        self.cursor.execute(f"SELECT ortacha_bal FROM student WHERE id = ? AND {where}", (student_id, *params))
+        row = self.cursor.fetchone()
+        if row is None:
+            return None
+        self.cursor.execute(f"SELECT COUNT(*) FROM student WHERE {where} AND ortacha_bal > ?",
+                            (*params, row[0]))
+        return self.cursor.fetchone()[0] + 1
+
+    def top_per_group(self, n=3, by="fakultet"):
+        """Har bir fakultet (yoki fakultet va kurs) bo'yicha eng yaxshi `n` talaba.
+
+        Guruhlar `student` jadvalidan indeks bo'yicha olinadi (NULL fakultet
+        yoki kurs ham alohida guruh), har bir guruh uchun reyting indeks
+        orqali o'qiladi. {guruh: qatorlar} qaytaradi.
+        """
+        columns = {"fakultet": ("fakultet",), "kurs": ("fakultet", "kurs")}[by]
+        self.cursor.execute(f"SELECT DISTINCT {', '.join(columns)} FROM student ORDER BY {', '.join(columns)}")
+        groups = self.cursor.fetchall()
+        where = " AND ".join(["ortacha_bal IS NOT NULL"] + [f"{column} IS ?" for column in columns])
+        return {group: next(self._leaderboard_pages(where, group, n), []) for group in groups}
 
     def get_last_saved_time(self, student_id):
         query = "SELECT saqlangan_vaqt FROM student WHERE id = ?"
@@ -97,8 +258,10 @@ def main_menu():
         print("6. Bazadagi talabalar sonini ko'rish")
         print("7. Talabaning oxirgi saqlangan vaqtini ko'rish")
         print("8. Dasturni yopish")
+        print("9. Baholar statistikasi")
+        print("10. Talabalar reytingi")
 
-        choice = input("Tanlovingizni kiriting (1-8): ")
+        choice = input("Tanlovingizni kiriting (1-10): ")
 
         if choice == "1":
             print("\nTalaba ma'lumotlarini kiriting:")
@@ -130,8 +293,11 @@ def main_menu():
                     break
                 value = input("Yangi qiymat: ")
                 updates[key] = value
-            db.update_student(student_id, updates)
-            print("Talaba ma'lumotlari yangilandi!")
+            try:
+                db.update_student(student_id, updates)
+                print("Talaba ma'lumotlari yangilandi!")
+            except ValueError as error:
+                print(f"Xatolik: {error}")
 
         elif choice == "4":
             student_id = int(input("\nO'chirilishi kerak bo'lgan talabaning ID raqamini kiriting: "))
@@ -160,6 +326,28 @@ def main_menu():
             print("Dastur yopildi. Xayr!")
             break
 
+        elif choice == "9":
+            fakultet = input("Fakultet (hammasi uchun bo'sh qoldiring): ")
+            filters = {"fakultet": fakultet} if fakultet else {}
+            for row in db.grade_stats(group_by=("oliy_oquv_yurti", "fakultet", "kurs"), **filters):
+                ortacha = f"{row['ortacha']:.2f}" if row["ortacha"] is not None else "-"
+                ogish = f"{row['standart_ogish']:.2f}" if row["standart_ogish"] is not None else "-"
+                print(f"{row['oliy_oquv_yurti']} | {row['fakultet']} | {row['kurs']}-kurs: "
+                      f"{row['soni']} ta talaba, o'rtacha {ortacha} (±{ogish}), "
+                      f"min {row['min']}, max {row['max']}")
+
+        elif choice == "10":
+            fakultet = input("Fakultet (hammasi uchun bo'sh qoldiring): ") or None
+            kurs = input("Kurs (hammasi uchun bo'sh qoldiring): ")
+            kurs = int(kurs) if kurs else None
+            for rows in db.iter_leaderboard(fakultet, kurs, PAGE_SIZE):
+                for row in rows:
+                    print(f"{row[0]}. {row[2]} {row[3]} ({row[10]}, {row[11]}-kurs): {row[12]}")
+                if input("Keyingi sahifa uchun Enter, chiqish uchun 'q': ").strip().lower() == "q":
+                    break
+            else:
+                print("Boshqa talaba yo'q.")
+
         else:
             print("Noto'g'ri tanlov! Iltimos, qayta urinib ko'ring.")
 
@@ -0,0 +1,284 @@
+"""Yuklama sinovlari uchun tezkor sintetik ma'lumot generatori.
+
+Qiymatlar NumPy yordamida butun bo'lak uchun bir yo'la (vektorlashtirilgan)
+tanlanadi va mavjud sxemalarga ommaviy yozish API lari orqali yoziladi.
+Bir xil `seed` va hajm har doim bir xil ma'lumot beradi.
+
+Misol::
+
+    python synthetic_data.py inson 1000000 --seed 7
+    python synthetic_data.py student 5000000 --workers 4
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import chain
+
+import numpy as np
+
+from main import db_file_path, bulk_insert, connect, load_module, BATCH_SIZE
+
+FAMILIYALAR = np.array([
+    "Karimov", "Aliyev", "Rahimov", "Yusupov", "Toshmatov", "Sobirov", "Nazarov",
+    "Qodirov", "Abdullayev", "Ismoilov", "Xolmatov", "Ergashev", "Tursunov",
+    "Usmonov", "Mirzayev", "Jo'rayev", "Saidov", "Hasanov", "Rustamov", "Sultonov",
+    "Normatov", "Boboyev", "Qurbonov", "Sharipov", "Olimov", "Umarov", "Mahmudov",
+    "Davletov", "Yo'ldoshev", "Nurmatov",
+])
+ERKAK_ISMLARI = np.array([
+    "Aziz", "Bobur", "Dilshod", "Jasur", "Sardor", "Sherzod", "Otabek", "Jahongir",
+    "Ulug'bek", "Akmal", "Farrux", "Bekzod", "Doniyor", "Javohir", "Islom", "Rustam",
+    "Temur", "Shoxrux", "Abdulla", "Anvar",
+])
+AYOL_ISMLARI = np.array([
+    "Malika", "Nodira", "Zarina", "Dilnoza", "Gulnora", "Madina", "Shahnoza", "Sevara",
+    "Feruza", "Nigora", "Mohira", "Zilola", "Kamola", "Lola", "Munisa", "Nilufar",
+    "Sabina", "Umida", "Yulduz", "Dildora",
+])
+MILLATLAR = np.array(["o'zbek", "tojik", "qozoq", "rus", "qoraqalpoq", "qirg'iz", "turkman", "tatar", "koreys"])
+MILLAT_ULUSHLARI = np.array([0.82, 0.05, 0.03, 0.03, 0.025, 0.015, 0.01, 0.01, 0.01])
+OLIYGOHLAR = np.array(["TATU", "O'zMU", "TDTU", "SamDU", "BuxDU", "TDIU", "NamDU", "FarDU"])
+FAKULTETLAR = np.array([
+    "Dasturiy injiniring", "Kompyuter injiniringi", "Axborot xavfsizligi",
+    "Iqtisodiyot", "Matematika", "Fizika", "Filologiya", "Tarix",
+])
+TASHKILOTLAR = [
+    "Yoshlar ittifoqi", "Zakovat klubi", "Robototexnika to'garagi", "Debat klubi",
+    "Sport klubi", "Volontyorlar", "IT Park rezidentlari", "Ilmiy jamiyat",
+]
+
+
+def _dates(rng, size, start, end):
+    """[start, end) oralig'idagi tasodifiy sanalar (YYYY-MM-DD satrlar)."""
+    first = np.datetime64(start)
+    days = rng.integers(0, (np.datetime64(end) - first).astype(int), size)
+    return np.datetime_as_string(first + days, unit="D")
+
+
+def person_columns(rng, size, born_from="1950-01-01", born_to="2010-01-01"):
+    """Shaxsning umumiy maydonlari uchun ustunlar (NumPy massivlari)."""
+    erkak = rng.random(size) < 0.5
+    familya = FAMILIYALAR[rng.integers(0, len(FAMILIYALAR), size)]
+    familya = np.where(erkak, familya, np.char.add(familya, "a"))
+    ism = np.where(erkak, ERKAK_ISMLARI[rng.integers(0, len(ERKAK_ISMLARI), size)],
+                   AYOL_ISMLARI[rng.integers(0, len(AYOL_ISMLARI), size)])
+    otasi = ERKAK_ISMLARI[rng.integers(0, len(ERKAK_ISMLARI), size)]
+    otasining_ismi = np.char.add(otasi, np.where(erkak, " o'g'li", " qizi"))
+    return {
+        "familya": familya,
+        "ism": ism,
+        "otasi_ismi": otasi,
+        "otasining_ismi": otasining_ismi,
+        "jinsi": np.where(erkak, "Erkak", "Ayol"),
+        "millati": MILLATLAR[rng.choice(len(MILLATLAR), size, p=MILLAT_ULUSHLARI)],
+        "boyi": np.clip(np.rint(np.where(erkak, rng.normal(176, 7, size), rng.normal(163, 6, size))), 140, 210).astype(int),
+        "ogirligi": np.round(np.clip(np.where(erkak, rng.normal(78, 11, size), rng.normal(62, 9, size)), 40, 150), 1),
+        "tugilgan_sana": _dates(rng, size, born_from, born_to),
+    }
+
+
+def inson_rows(rng, size):
+    c = person_columns(rng, size)
+    return zip(*(c[k].tolist() for k in ("familya", "ism", "otasi_ismi", "jinsi", "millati", "boyi", "tugilgan_sana")))
+
+
+def ticher_rows(rng, size):
+    c = person_columns(rng, size, "1955-01-01", "1998-01-01")
+    return zip(*(c[k].tolist() for k in ("familya", "ism", "otasining_ismi", "jinsi", "millati", "ogirligi", "tugilgan_sana")))
+
+
+def student_rows(rng, size):
+    c = person_columns(rng, size, "1998-01-01", "2008-01-01")
+    oliygoh = OLIYGOHLAR[rng.integers(0, len(OLIYGOHLAR), size)]
+    fakultet = FAKULTETLAR[rng.integers(0, len(FAKULTETLAR), size)]
+    kurs = rng.integers(1, 5, size)
+    ortacha_bal = np.round(np.clip(rng.normal(3.8, 0.5, size), 2.0, 5.0), 2)
+    return zip(*(column.tolist() for column in (
+        c["familya"], c["ism"], c["otasining_ismi"], c["jinsi"], c["millati"], c["ogirligi"],
+        c["tugilgan_sana"], oliygoh, fakultet, kurs, ortacha_bal)))
+
+
+def university_rows(rng, size, offset=0):
+    c = person_columns(rng, size, "1998-01-01", "2008-01-01")
+    emails = [f"talaba{offset + i}@example.uz" for i in range(size)]
+    phones = np.char.add("+99890", np.char.zfill(rng.integers(0, 10 ** 7, size).astype(str), 7))
+    return zip(c["ism"].tolist(), c["familya"].tolist(), c["tugilgan_sana"].tolist(), phones.tolist(), emails)
+
+
+def _chunked(generate, seed, size, chunk_size=BATCH_SIZE):
+    """Butun hajmni bo'laklarga bo'lib, har bir bo'lakni vektorlashtirib yaratadi."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, size, chunk_size):
+        yield generate(rng, min(chunk_size, size - start))
+
+
+def _university_student_rows(rng, size, offset, group_count):
+    """students qatorlari (guruhi bilan); email raqamlari `offset` dan boshlanadi."""
+    for start in range(0, size, BATCH_SIZE):
+        count = min(BATCH_SIZE, size - start)
+        groups = rng.integers(1, group_count + 1, count).tolist()
+        for row, group_id in zip(university_rows(rng, count, offset + start), groups):
+            yield row + (group_id,)
+
+
+def write(target, size, seed, db_name, offset=None, group_count=None):
+    """`target` sxemasiga `size` ta qator yozadi. Yozilgan qatorlar sonini qaytaradi.
+
+    `offset` va `group_count` faqat university uchun: email raqamlari qayerdan
+    boshlanishi va talabalar taqsimlanadigan guruhlar soni.
+    """
+    if target == "inson":
+        import inson_db
+        db = inson_db.DatabaseManager(db_name, profile="bulk-load")
+        total, _ = db.add_records(chain.from_iterable(_chunked(inson_rows, seed, size)))
+        db.close_connection()
+    elif target == "ticher":
+        import ticher_db
+        db = ticher_db.UsersDatabase(db_name, profile="bulk-load")
+        total, _ = db.insert_many(chain.from_iterable(_chunked(ticher_rows, seed, size)))
+        db.close_connection()
+    elif target == "student":
+        import student_db
+        db = student_db.StudentDatabase(db_name, profile="bulk-load")
+        total, _ = db.add_students(chain.from_iterable(_chunked(student_rows, seed, size)))
+        db.close_connection()
+    elif target == "university":
+        total = _write_university(size, seed, db_name, offset, group_count)
+    else:
+        raise ValueError(f"Noma'lum sxema: {target}")
+    return total
+
+
+def _write_university(size, seed, db_name, offset=None, group_count=None):
+    """K.KID_AU_23_db sxemasi: guruhlar, tashkilotlar va talabalar."""
+    university = load_module("K.KID_AU_23_db.py")
+    app = university.UniversityApp(db_name, profile="bulk-load")
+    rng = np.random.default_rng(seed)
+    group_count = group_count or max(1, size // 25)
+    with app.db.pool.connection() as conn:
+        # groups jadvali students.group_id uchun; UniversityApp uni yaratmaydi
+        conn.execute("CREATE TABLE IF NOT EXISTS groups (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE NOT NULL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS organizations (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE NOT NULL)")
+        conn.commit()
+        bulk_insert(conn, "INSERT OR IGNORE INTO groups (name) VALUES (?)",
+                    ((f"{FAKULTETLAR[i % len(FAKULTETLAR)][:3].upper()}-{i:05d}",) for i in range(group_count)))
+        bulk_insert(conn, "INSERT OR IGNORE INTO organizations (name) VALUES (?)",
+                    ((name,) for name in TASHKILOTLAR))
+        if offset is None:
+            offset = conn.execute("SELECT COALESCE(MAX(id), 0) FROM students").fetchone()[0]
+        total, _ = bulk_insert(conn, UNIVERSITY_INSERT,
+                               _university_student_rows(rng, size, offset, group_count))
+    app.db.close()
+    return total
+
+
+SHARD_TABLES = {"inson": "inson", "ticher": "ticher", "student": "student", "university": "students"}
+UNIVERSITY_INSERT = """
+    INSERT INTO students (first_name, last_name, birth_date, phone_number, email, group_id)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+# Bo'lak fayllarga to'g'ridan-to'g'ri yoziladigan ustunlar (oxirgisi - saqlangan vaqt)
+SHARD_INSERTS = {
+    "inson": (inson_rows, ("familya", "ism", "otasi_ismi", "jinsi", "millati", "boyi", "tugilgan_sana",
+                           "saqlangan_vaqt")),
+    "ticher": (ticher_rows, ("familya", "ismi", "otasining_ismi", "jinsi", "millati", "ogirligi",
+                             "tugilgan_sanasi", "saqlangan_vaqti")),
+    "student": (student_rows, ("familya", "ismi", "otasining_ismi", "jinsi", "millati", "ogirligi",
+                               "tugilgan_sana", "oliy_oquv_yurti", "fakultet", "kurs", "ortacha_bal")),
+}
+
+
+def _write_shard(args):
+    """Bo'lak faylga faqat jadvalning o'zini (triggerlar va indekslarsiz) yozadi.
+
+    Triggerlar va indekslar asosiy bazada `merge_shards` paytida bir marta ishlaydi.
+    """
+    target, size, seed, db_name, shard_name, offset, group_count = args
+    table = SHARD_TABLES[target]
+    source = sqlite3.connect(db_name)
+    ddl = source.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()[0]
+    source.close()
+    conn = connect(shard_name, "bulk-load")
+    conn.execute(ddl)
+    if target == "university":
+        rows = _university_student_rows(np.random.default_rng(seed), size, offset, group_count)
+        bulk_insert(conn, UNIVERSITY_INSERT, rows)
+    else:
+        generate_rows, columns = SHARD_INSERTS[target]
+        rows = chain.from_iterable(_chunked(generate_rows, seed, size))
+        if columns[-1].startswith("saqlangan_vaqt"):
+            saved_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            rows = (row + (saved_at,) for row in rows)
+        bulk_insert(conn, f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    rows)
+    conn.close()
+    return shard_name
+
+
+def merge_shards(db_name, target, shard_names):
+    """Bo'lak fayllarni asosiy bazaga qo'shib, keyin o'chiradi.
+
+    id lar asosiy bazada qaytadan beriladi, triggerlar (hisoblagich, qidiruv
+    indeksi, statistika, jurnal) shu yerda bir marta ishlaydi.
+    """
+    table = SHARD_TABLES[target]
+    conn = connect(db_name, "bulk-load")
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})") if row[1] != "id"]
+    column_list = ", ".join(columns)
+    for shard_name in shard_names:
+        conn.execute("ATTACH DATABASE ? AS shard", (shard_name,))
+        with conn:
+            conn.execute(f"INSERT INTO main.{table} ({column_list}) SELECT {column_list} FROM shard.{table} ORDER BY id")
+        conn.execute("DETACH DATABASE shard")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(shard_name + suffix):
+                os.remove(shard_name + suffix)
+    conn.close()
+
+
+def generate(target, size, seed=0, db_name=None, workers=1):
+    """Sintetik ma'lumot yaratadi; `workers > 1` bo'lsa parallel bo'laklarda."""
+    db_name = db_name or db_file_path(f"{target}_db.db" if target != "university" else "university.db")
+    started = time.perf_counter()
+    if workers <= 1:
+        write(target, size, seed, db_name)
+    else:
+        # Asosiy bazada sxema, triggerlar va (university uchun) barcha guruhlar
+        # bo'lishi uchun avval bo'sh yozuv; bo'laklar shu guruhlarga bog'lanadi
+        group_count = max(1, size // 25)
+        write(target, 0, seed, db_name, group_count=group_count)
+        first_id = 0
+        if target == "university":
+            conn = sqlite3.connect(db_name)
+            first_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM students").fetchone()[0]
+            conn.close()
+        sizes = [size // workers + (1 if i < size % workers else 0) for i in range(workers)]
+        # Har bir bo'lak o'z email raqamlari oralig'ini oladi (takrorlanmasligi uchun)
+        offsets = [first_id + sum(sizes[:i]) for i in range(workers)]
+        jobs = [(target, part, [seed, i], db_name, f"{db_name}.shard{i}", offsets[i], group_count)
+                for i, part in enumerate(sizes)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shard_names = list(pool.map(_write_shard, jobs))
+        merge_shards(db_name, target, shard_names)
+    elapsed = time.perf_counter() - started
+    print(f"{target}: {size} qator {elapsed:.1f} soniyada ({size / elapsed * 60:,.0f} qator/daqiqa)")
+    return db_name
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sintetik ma'lumot generatori")
+    parser.add_argument("target", choices=sorted(SHARD_TABLES))
+    parser.add_argument("size", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db", help="baza fayli (standart: all_databas dagi fayl)")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+    generate(args.target, args.size, args.seed, args.db, args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
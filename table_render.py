@@ -0,0 +1,76 @@
+"""Katta jadvallarni bo'laklab chiqaruvchi "grid" ko'rinishidagi renderer.
+
+`tabulate` butun jadval satrini xotirada yig'ib, keyin chiqaradi. Bu yerda
+ustun kengliklari oldindan (namuna yoki saqlangan statistika asosida)
+aniqlanadi va qatorlar kelishi bilan darhol yoziladi.
+"""
+import sys
+
+# Juda uzun qiymatlar ustunni cheksiz kengaytirmasligi uchun
+MAX_COLUMN_WIDTH = 40
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def widths_from_sample(headers, rows, max_width=MAX_COLUMN_WIDTH):
+    """Sarlavhalar va namunaviy qatorlar bo'yicha ustun kengliklari."""
+    widths = [len(header) for header in headers]
+    for row in rows:
+        for i, value in enumerate(row):
+            widths[i] = max(widths[i], len(_text(value)))
+    return [min(width, max_width) for width in widths]
+
+
+class GridWriter:
+    """Qatorlarni kelishi bilan "grid" formatida yozadi.
+
+    `widths` berilmasa, birinchi yoziladigan bo'lak namuna sifatida olinadi.
+    Kenglikdan oshgan qiymatlar "…" bilan qisqartiriladi.
+    """
+
+    def __init__(self, headers, out=None, widths=None):
+        self.headers = list(headers)
+        self.out = out or sys.stdout
+        self.widths = list(widths) if widths else None
+        self.rows_written = 0
+        self._started = False
+
+    def _cell(self, value, width):
+        text = _text(value)
+        if len(text) > width:
+            text = text[:width - 1] + "…"
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return text.rjust(width)
+        return text.ljust(width)
+
+    def _line(self, fill):
+        return "+" + "+".join(fill * (width + 2) for width in self.widths) + "+\n"
+
+    def _row(self, row):
+        cells = (self._cell(value, width) for value, width in zip(row, self.widths))
+        return "| " + " | ".join(cells) + " |\n"
+
+    def _start(self, sample):
+        if self.widths is None:
+            self.widths = widths_from_sample(self.headers, sample)
+        self.out.write(self._line("-") + self._row(self.headers) + self._line("="))
+        self._started = True
+
+    def write_rows(self, rows):
+        """Qatorlar bo'lagini yozadi."""
+        if not self._started:
+            rows = list(rows)
+            self._start(rows)
+        separator = self._line("-")
+        for row in rows:
+            self.out.write(self._row(row) + separator)
+            self.rows_written += 1
+        self.out.flush()
+
+    def close(self):
+        """Bo'sh jadval bo'lsa ham sarlavhani chiqaradi."""
+        if not self._started:
+            self._start([])
+        self.out.flush()
@@ -0,0 +1,83 @@
+"""load_groups/load_students so'rovlari soni ma'lumot hajmiga bog'liq emasligini tekshiradi.
+
+Ishga tushirish: python -m pytest -q test_eager_loading.py
+"""
+import importlib
+import os
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+# selectin: har bosqichga bitta so'rov, joined: bitta JOIN
+EXPECTED_QUERIES = {"selectin": 4, "joined": 1}
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("university")
+    cwd = os.getcwd()
+    # Modul import paytida joriy papkadagi university.db ni ochadi
+    os.chdir(directory)
+    try:
+        module = importlib.import_module("sqlchemiy_test")
+    finally:
+        os.chdir(cwd)
+    original = module.session
+    yield module
+    module.session = original
+
+
+@pytest.fixture
+def engine(app, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'eager.db'}")
+    app.Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def seed(app, engine, groups, students_per_group):
+    """Bazani `groups` ta guruhgacha (har birida `students_per_group` ta talaba) to'ldiradi."""
+    session = sessionmaker(bind=engine)()
+    organization = session.query(app.Organization).filter_by(name="Org").first()
+    if organization is None:
+        organization = app.Organization(name="Org")
+        session.add(organization)
+    start = session.query(app.Group).count()
+    for g in range(start, groups):
+        group = app.Group(name=f"Guruh {g}")
+        session.add(group)
+        for s in range(students_per_group):
+            student = app.Student(first_name=f"Ism{s}", last_name=f"Familya{g}", email=f"{g}.{s}@uni.uz",
+                                  group=group)
+            session.add(app.StudentOrganization(student=student, organization=organization))
+    session.commit()
+    session.close()
+
+
+def count_queries(app, engine, load, strategy):
+    # Identity map dagi obyektlar yuklashga ta'sir qilmasligi uchun har safar yangi sessiya
+    app.session = sessionmaker(bind=engine)()
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        loaded = load(strategy=strategy)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+        app.session.close()
+    assert loaded
+    return len(statements)
+
+
+@pytest.mark.parametrize("strategy", sorted(EXPECTED_QUERIES))
+@pytest.mark.parametrize("loader", ["load_groups", "load_students"])
+def test_query_count_does_not_grow(app, engine, loader, strategy):
+    counts = []
+    for groups, students in ((2, 3), (40, 10)):
+        seed(app, engine, groups, students)
+        counts.append(count_queries(app, engine, getattr(app, loader), strategy))
+    assert counts[0] == counts[1] == EXPECTED_QUERIES[strategy]
@@ -1,13 +1,19 @@
-from main import db_file_path
-import sqlite3
+from main import db_file_path, connect, bulk_insert, bulk_update, iter_pages, page_through, BATCH_SIZE, PAGE_SIZE
+import row_counter
+import changelog
 from datetime import datetime
 
+# Yangilash mumkin bo’lgan ustunlar
+TICHER_COLUMNS = ("familya", "ismi", "otasining_ismi", "jinsi", "millati", "ogirligi", "tugilgan_sanasi")
+
 
 class UsersDatabase:
     db_name=db_file_path("ticher_db.db")
-    def __init__(self):
+    def __init__(self, db_name=None, profile=None):
         """Bazaga ulanish va jadvalni yaratish."""
-        self.conn = sqlite3.connect(self.db_name)
+        if db_name:
+            self.db_name = db_name
+        self.conn = connect(self.db_name, profile)
         self.cursor = self.conn.cursor()
         self.create_table()
 
@@ -27,6 +33,8 @@ class UsersDatabase:
             )
         """)
         self.conn.commit()
+        row_counter.install_counter(self.conn, "ticher")
+        changelog.install(self.conn, "ticher")
 
     def insert_data(self, familya, ismi, otasining_ismi, jinsi, millati, ogirligi, tugilgan_sanasi):
         """Yangi ma’lumot kiritish."""
@@ -37,16 +45,40 @@ class UsersDatabase:
         """, (familya, ismi, otasining_ismi, jinsi, millati, ogirligi, tugilgan_sanasi, saqlangan_vaqti))
         self.conn.commit()
 
+    def insert_many(self, rows, chunk_size=BATCH_SIZE):
+        """Ko’p ma’lumotni bo’laklab, tranzaksiya ichida kiritish.
+
+        `rows` - (familya, ismi, otasining_ismi, jinsi, millati, ogirligi, tugilgan_sanasi)
+        ko’rinishidagi qatorlar. (kiritilgan qatorlar soni, qator/soniya) qaytaradi.
+        """
+        saqlangan_vaqti = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = (tuple(row) + (saqlangan_vaqti,) for row in rows)
+        total, rate = bulk_insert(self.conn, """
+            INSERT INTO ticher (familya, ismi, otasining_ismi, jinsi, millati, ogirligi, tugilgan_sanasi, saqlangan_vaqti)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows, chunk_size)
+        return total, rate
+
     def view_data(self):
         """Ma’lumotlarni ko’rish."""
         self.cursor.execute("SELECT * FROM ticher")
         return self.cursor.fetchall()
 
+    def view_data_pages(self, page_size=PAGE_SIZE):
+        """Ma’lumotlarni id bo’yicha sahifalab qaytaruvchi generator."""
+        return iter_pages(self.conn, "ticher", page_size)
+
     def update_data(self, id, column, new_value):
         """Ma’lumotni yangilash."""
-        query = f"UPDATE ticher SET {column} = ? WHERE id = ?"
-        self.cursor.execute(query, (new_value, id))
-        self.conn.commit()
+        self.update_many([(id, {column: new_value})])
+
+    def update_many(self, updates):
+        """(id, {ustun: qiymat}) juftlarini bitta tranzaksiyada yangilash.
+
+        Faqat `TICHER_COLUMNS` dagi ustunlarni o’zgartirish mumkin, aks holda
+        `ValueError`. Yangilangan qatorlar sonini qaytaradi.
+        """
+        return bulk_update(self.conn, "ticher", TICHER_COLUMNS, updates)
 
     def delete_data(self, id):
         """Ma’lumotni o’chirish."""
@@ -55,8 +87,7 @@ class UsersDatabase:
 
     def count_data(self):
         """Jadvaldagi ma’lumotlar sonini qaytarish."""
-        self.cursor.execute("SELECT COUNT(*) FROM ticher")
-        return self.cursor.fetchone()[0]
+        return row_counter.get_count(self.conn, "ticher")
 
     def close_connection(self):
         """Bazani ulanishini yopish."""
@@ -89,19 +120,18 @@ def main():
             print("Ma’lumot muvaffaqiyatli qo’shildi!")
 
         elif choice == "2":
-            data = db.view_data()
-            if data:
-                for row in data:
-                    print(row)
-            else:
+            if not page_through(db.view_data_pages()):
                 print("Jadvalda ma’lumot yo’q!")
 
         elif choice == "3":
             id = int(input("Yangilamoqchi bo’lgan ma’lumot ID raqamini kiriting: "))
             column = input("Yangilamoqchi bo’lgan ustun nomini kiriting (familya, ismi, otasining_ismi, jinsi, millati, ogirligi, tugilgan_sanasi): ")
             new_value = input("Yangi qiymatni kiriting: ")
-            db.update_data(id, column, new_value)
-            print("Ma’lumot muvaffaqiyatli yangilandi!")
+            try:
+                db.update_data(id, column, new_value)
+                print("Ma’lumot muvaffaqiyatli yangilandi!")
+            except ValueError as error:
+                print(f"Xatolik: {error}")
 
         elif choice == "4":
             id = int(input("O’chirmoqchi bo’lgan ma’lumot ID raqamini kiriting: "))